@@ -0,0 +1,175 @@
+import os
+import time
+import socket
+import sqlite3
+import logging
+import argparse
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+from distributed import Coordinator, SOURCE_ADAPTERS, run_worker
+from network_guard import NetworkGuard
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
+logger = logging.getLogger(__name__)
+
+DEFAULT_BACKFILL_QUEUE_PATH = "database/news/queue/backfill.sqlite"
+
+# 동시에 검색·디코딩을 수행할 샤드 수 (네트워크 I/O 위주이므로 스레드)
+DEFAULT_DISCOVERY_THREADS = 4
+# 샤드 완료 대기 중 결과 반영 주기 (초)
+POLL_SECONDS = 2.0
+
+_SHARD_SCHEMA = """
+CREATE TABLE IF NOT EXISTS shards (
+    source     TEXT NOT NULL,
+    query      TEXT NOT NULL,
+    day        TEXT NOT NULL,
+    status     TEXT NOT NULL DEFAULT 'pending',
+    found      INTEGER,
+    enqueued   INTEGER,
+    error      TEXT,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (source, query, day)
+);
+"""
+
+
+class ShardTracker:
+    """
+    (소스, 쿼리, 일자) 단위 백필 샤드의 진행 상태 저장소.
+    작업 큐와 같은 SQLite 파일에 두어 샤드 검색 진행도와 기사 수집 진행도가 함께 보존됩니다.
+    샤드 상태: pending → discovered(기사 작업 적재 완료) / failed(다음 실행에서 재시도)
+    """
+    def __init__(self, path: str):
+        self.conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.conn.execute("PRAGMA busy_timeout=30000")
+        self.conn.executescript(_SHARD_SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def plan(self, sources: Dict[str, str], start: date, end: date) -> int:
+        """기간을 일 단위 샤드로 분할하여 등록 (이미 있는 샤드는 유지, 실패 샤드는 재시도 대상으로 복귀)"""
+        now = time.time()
+        day = start
+        while day <= end:
+            for source, query in sources.items():
+                self.conn.execute(
+                    "INSERT OR IGNORE INTO shards (source, query, day, updated_at) VALUES (?, ?, ?, ?)",
+                    (source, query, day.isoformat(), now),
+                )
+            day += timedelta(days=1)
+        self.conn.execute("UPDATE shards SET status = 'pending', error = NULL WHERE status = 'failed'")
+        return self.conn.execute("SELECT COUNT(*) FROM shards WHERE status = 'pending'").fetchone()[0]
+
+    def pending(self, sources: Dict[str, str], start: date, end: date) -> List[Tuple[str, str, date]]:
+        rows = self.conn.execute(
+            "SELECT source, query, day FROM shards WHERE status = 'pending' AND day BETWEEN ? AND ? ORDER BY day, source",
+            (start.isoformat(), end.isoformat()),
+        ).fetchall()
+        return [(s, q, date.fromisoformat(d)) for s, q, d in rows if sources.get(s) == q]
+
+    def mark(self, source: str, query: str, day: date, status: str,
+             found: Optional[int] = None, enqueued: Optional[int] = None, error: Optional[str] = None):
+        self.conn.execute(
+            "UPDATE shards SET status = ?, found = ?, enqueued = ?, error = ?, updated_at = ? "
+            "WHERE source = ? AND query = ? AND day = ?",
+            (status, found, enqueued, error, time.time(), source, query, day.isoformat()),
+        )
+
+    def counts(self) -> Dict[str, int]:
+        return dict(self.conn.execute("SELECT status, COUNT(*) FROM shards GROUP BY status").fetchall())
+
+
+def _discover_shard(source: str, query: str, day: date, sot_path: str, net_guard: NetworkGuard):
+    """
+    샤드 1개 검색 + Google URL 디코딩 (스레드 풀에서 실행, 샤드마다 독립 어댑터).
+    일자 지정 검색은 브라우저 폴백을 쓰지 않으므로 Total War는 생성만 되고 가동되지 않음
+    """
+    crawler = SOURCE_ADAPTERS[source](sot_path=sot_path, net_guard=net_guard)
+    items = crawler.search_news(query, day)
+    # 해석한 URL(디코딩 실패 포함)을 함께 넘겨 코디네이터 스레드에서 다시 디코딩하지 않음
+    return crawler, items, [crawler.resolve_url(item) for item in items]
+
+
+def run_backfill(start: date, end: date, sources: Dict[str, str], num_workers: int,
+                 discovery_threads: int = DEFAULT_DISCOVERY_THREADS,
+                 queue_path: str = DEFAULT_BACKFILL_QUEUE_PATH, sot_path: str = "database/news/news_sot.jsonl",
+                 http2: bool = False) -> int:
+    """
+    기간 백필: 일 단위 샤드 검색을 병렬로 수행하며 기사 작업을 큐에 적재하고,
+    워커 프로세스가 수집한 결과를 코디네이터가 SOT에 직렬·중복 검사 저장합니다.
+    같은 인자로 다시 실행하면 미완료 샤드와 큐에 남은 작업부터 이어서 진행합니다.
+    """
+    os.makedirs(os.path.dirname(sot_path) or ".", exist_ok=True)
+    # 검색 스레드들이 코디네이터의 NetworkGuard(연결 풀·DNS 캐시)를 공유
+    coordinator = Coordinator(queue_path, sot_path, collect_stored=False, net_guard=NetworkGuard(http2=http2))
+    shards = ShardTracker(queue_path)
+    workers: List[multiprocessing.Process] = []
+    try:
+        shards.plan(sources, start, end)
+        todo = shards.pending(sources, start, end)
+        logger.info(f"[Backfill] {start} ~ {end}, 소스 {len(sources)}개 → 미완료 샤드 {len(todo)}개")
+
+        # 적재 중 표시: 큐가 잠시 비어도 워커가 종료하지 않음
+        coordinator.queue.set_discovering(bool(todo))
+        ctx = multiprocessing.get_context("spawn")
+        for i in range(num_workers):
+            p = ctx.Process(target=run_worker, args=(queue_path, sot_path, f"{socket.gethostname()}:backfill{i}", True, http2))
+            p.start()
+            workers.append(p)
+
+        # 진행 중 샤드 수를 스레드 수로 제한하여 검색 결과가 메모리에 쌓이지 않게 함
+        with ThreadPoolExecutor(max_workers=discovery_threads) as pool:
+            in_flight = {}
+            while todo or in_flight:
+                while todo and len(in_flight) < discovery_threads:
+                    shard = todo.pop(0)
+                    in_flight[pool.submit(_discover_shard, *shard, sot_path, coordinator.net_guard)] = shard
+                done, _ = wait(in_flight, timeout=POLL_SECONDS, return_when=FIRST_COMPLETED)
+                for future in done:
+                    source, query, day = in_flight.pop(future)
+                    try:
+                        crawler, items, urls = future.result()
+                        enqueued = coordinator.enqueue_items(crawler, items, urls)
+                        shards.mark(source, query, day, "discovered", found=len(items), enqueued=enqueued)
+                    except Exception as e:
+                        logger.error(f"[Backfill] 샤드 실패 ({source} {day}): {e}")
+                        shards.mark(source, query, day, "failed", error=str(e))
+                # 검색과 병행하여 워커 결과를 계속 SOT에 반영
+                coordinator.drain_results()
+
+        coordinator.queue.set_discovering(False)
+        logger.info(f"[Backfill] 샤드 검색 완료: {shards.counts()}")
+        coordinator.wait(workers)
+    finally:
+        coordinator.queue.set_discovering(False)
+        for p in workers:
+            p.join()
+        shards.close()
+        coordinator.close()
+
+    logger.info(f"🏁 [Backfill] 완료: 이번 실행 저장 {coordinator.stored_count}건")
+    return coordinator.stored_count
+
+
+if __name__ == "__main__":
+    from main import QUERY_KO, QUERY_EN, SOT_PATH
+
+    default_queries = {"naver": QUERY_KO, "google": QUERY_KO, "google_global": QUERY_EN}
+    parser = argparse.ArgumentParser(description="기간 지정 백필 (일 단위 샤드)")
+    parser.add_argument("--start", required=True, type=date.fromisoformat, help="시작일 (YYYY-MM-DD)")
+    parser.add_argument("--end", type=date.fromisoformat, default=date.today(), help="종료일 (YYYY-MM-DD, 포함)")
+    parser.add_argument("--sources", default=",".join(default_queries), help="쉼표로 구분한 소스 (naver,google,google_global)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="로컬 수집 워커 프로세스 수")
+    parser.add_argument("--discovery-threads", type=int, default=DEFAULT_DISCOVERY_THREADS, help="동시 샤드 검색 수")
+    parser.add_argument("--queue", default=DEFAULT_BACKFILL_QUEUE_PATH, help="샤드/작업 큐 SQLite 경로")
+    parser.add_argument("--http2", action="store_true", help="샤드 검색과 로컬 워커에 HTTP/2 다중화 + DNS 캐시 사용")
+    args = parser.parse_args()
+
+    if args.start > args.end:
+        parser.error("--start는 --end보다 이후일 수 없습니다")
+    selected = {s: default_queries[s] for s in args.sources.split(",") if s in default_queries}
+    run_backfill(args.start, args.end, selected, args.workers, args.discovery_threads, args.queue, SOT_PATH, http2=args.http2)
@@ -0,0 +1,243 @@
+import os
+import sys
+import ssl
+import time
+import socket
+import argparse
+import tempfile
+import threading
+import statistics
+import subprocess
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+import h2.config
+import h2.connection
+import h2.events
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from network_guard import NetworkGuard  # noqa: E402
+
+# 실제 고빈도 호스트를 흉내 내는 로컬 호스트명 (모두 127.0.0.1로 해석)
+STAND_IN_HOSTS = ("news.google.test", "search.naver.test", "n.news.naver.test")
+
+
+class StandInServer:
+    """
+    HTTP/2(h2)와 HTTP/1.1을 ALPN으로 협상하는 로컬 TLS 서버.
+    원격 서버와의 왕복 지연을 흉내 내기 위해 새 연결마다 handshake_delay, 요청마다 rtt만큼 지연 후 응답합니다.
+    """
+    def __init__(self, certfile: str, keyfile: str, body: bytes, handshake_delay: float, rtt: float):
+        self.body = body
+        self.handshake_delay = handshake_delay
+        self.rtt = rtt
+        self.stats = Counter()
+        self._stats_lock = threading.Lock()
+        self.ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        self.ctx.load_cert_chain(certfile, keyfile)
+        self.ctx.set_alpn_protocols(["h2", "http/1.1"])
+        self.sock = socket.create_server(("127.0.0.1", 0), backlog=256)
+        self.port = self.sock.getsockname()[1]
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+
+    def _count(self, key: str, n: int = 1):
+        with self._stats_lock:
+            self.stats[key] += n
+
+    def reset(self):
+        with self._stats_lock:
+            self.stats.clear()
+
+    def _accept_loop(self):
+        while True:
+            raw, _ = self.sock.accept()
+            threading.Thread(target=self._handle, args=(raw,), daemon=True).start()
+
+    def _handle(self, raw: socket.socket):
+        self._count("connections")
+        time.sleep(self.handshake_delay)
+        try:
+            conn = self.ctx.wrap_socket(raw, server_side=True)
+        except (ssl.SSLError, OSError):
+            raw.close()
+            return
+        protocol = conn.selected_alpn_protocol() or "http/1.1"
+        self._count(protocol)
+        try:
+            if protocol == "h2":
+                self._serve_h2(conn)
+            else:
+                self._serve_http1(conn)
+        except (ssl.SSLError, OSError):
+            pass
+        finally:
+            conn.close()
+
+    def _serve_http1(self, conn: ssl.SSLSocket):
+        buffer = b""
+        while True:
+            while b"\r\n\r\n" not in buffer:
+                data = conn.recv(65536)
+                if not data:
+                    return
+                buffer += data
+            head, buffer = buffer.split(b"\r\n\r\n", 1)
+            self._count("requests")
+            time.sleep(self.rtt)
+            conn.sendall(b"HTTP/1.1 200 OK\r\nContent-Type: text/html; charset=utf-8\r\n"
+                         b"Content-Length: " + str(len(self.body)).encode() + b"\r\n\r\n" + self.body)
+            if b"connection: close" in head.lower():
+                return
+
+    def _serve_h2(self, conn: ssl.SSLSocket):
+        h2_conn = h2.connection.H2Connection(config=h2.config.H2Configuration(client_side=False))
+        lock = threading.Lock()
+        pending: Dict[int, bytes] = {}
+
+        def flush():
+            # 흐름 제어 창이 허용하는 만큼만 DATA 프레임 전송, 나머지는 WINDOW_UPDATE 수신 후
+            for stream_id in list(pending):
+                data = pending[stream_id]
+                window = min(h2_conn.local_flow_control_window(stream_id), len(data))
+                frame = h2_conn.max_outbound_frame_size
+                sent = 0
+                while sent < window:
+                    chunk = data[sent:sent + min(frame, window - sent)]
+                    h2_conn.send_data(stream_id, chunk)
+                    sent += len(chunk)
+                pending[stream_id] = data[sent:]
+                if not pending[stream_id]:
+                    h2_conn.end_stream(stream_id)
+                    del pending[stream_id]
+            conn.sendall(h2_conn.data_to_send())
+
+        def respond(stream_id: int):
+            with lock:
+                try:
+                    h2_conn.send_headers(stream_id, [
+                        (":status", "200"), ("content-type", "text/html; charset=utf-8"),
+                        ("content-length", str(len(self.body))),
+                    ])
+                    pending[stream_id] = self.body
+                    flush()
+                except Exception:
+                    pass
+
+        with lock:
+            h2_conn.initiate_connection()
+            conn.sendall(h2_conn.data_to_send())
+        while True:
+            data = conn.recv(65536)
+            if not data:
+                return
+            with lock:
+                for event in h2_conn.receive_data(data):
+                    if isinstance(event, h2.events.RequestReceived):
+                        self._count("requests")
+                        # 스트림별로 지연 후 응답하여 같은 연결의 요청들이 서로를 막지 않음
+                        threading.Timer(self.rtt, respond, args=(event.stream_id,)).start()
+                    elif isinstance(event, h2.events.ConnectionTerminated):
+                        return
+                flush()
+
+
+class ResolverStub:
+    """STAND_IN_HOSTS를 127.0.0.1로 해석하고 조회마다 dns_delay만큼 지연 (조회 횟수 집계)"""
+    def __init__(self, dns_delay: float):
+        self.dns_delay = dns_delay
+        self.lookups = 0
+        self._lock = threading.Lock()
+        self._real = socket.getaddrinfo
+
+    def __call__(self, host, port, *args, **kwargs):
+        if host in STAND_IN_HOSTS:
+            with self._lock:
+                self.lookups += 1
+            time.sleep(self.dns_delay)
+            host = "127.0.0.1"
+        return self._real(host, port, *args, **kwargs)
+
+
+def _make_cert(directory: str):
+    cert, key = os.path.join(directory, "cert.pem"), os.path.join(directory, "key.pem")
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+         "-keyout", key, "-out", cert, "-subj", f"/CN={STAND_IN_HOSTS[0]}",
+         "-addext", "subjectAltName=" + ",".join(f"DNS:{h}" for h in STAND_IN_HOSTS)],
+        check=True, capture_output=True,
+    )
+    return cert, key
+
+
+def run_mode(name: str, guard: NetworkGuard, urls: List[str], concurrency: int,
+             server: StandInServer, resolver: ResolverStub) -> Dict:
+    server.reset()
+    resolver.lookups = 0
+    latencies = []
+
+    def fetch(url: str):
+        started = time.perf_counter()
+        page = guard.fetch_html(url, guard.get_rotated_headers())
+        latencies.append(time.perf_counter() - started)
+        return page is not None and page["html"] is not None
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        ok = sum(pool.map(fetch, urls))
+    elapsed = time.perf_counter() - started
+    guard.close()
+    latencies.sort()
+    return {
+        "mode": name,
+        "ok": ok,
+        "elapsed": elapsed,
+        "p50": statistics.median(latencies) * 1000,
+        "p95": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "sockets": server.stats["connections"],
+        "h2": server.stats["h2"],
+        "http1": server.stats["http/1.1"],
+        "dns": resolver.lookups,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="NetworkGuard 전송 경로 벤치마크 (requests vs httpx HTTP/2 + DNS 캐시)")
+    parser.add_argument("--requests", type=int, default=300, help="모드별 총 요청 수 (3개 호스트에 분산)")
+    parser.add_argument("--concurrency", type=int, default=8, help="동시 요청 스레드 수")
+    parser.add_argument("--body-kb", type=int, default=64, help="응답 본문 크기 (KiB)")
+    parser.add_argument("--rtt-ms", type=float, default=20.0, help="요청당 모의 왕복 지연")
+    parser.add_argument("--handshake-ms", type=float, default=40.0, help="새 연결(TCP+TLS)당 모의 지연")
+    parser.add_argument("--dns-ms", type=float, default=15.0, help="DNS 조회당 모의 지연")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cert, key = _make_cert(tmp)
+        # 두 경로 모두 로컬 자체 서명 인증서를 신뢰하도록 지정
+        os.environ["REQUESTS_CA_BUNDLE"] = cert
+        os.environ["SSL_CERT_FILE"] = cert
+
+        body = (b"<html><head><meta charset='utf-8'><title>stand-in</title></head><body><p>"
+                + b"x" * (args.body_kb * 1024) + b"</p></body></html>")
+        server = StandInServer(cert, key, body, args.handshake_ms / 1000, args.rtt_ms / 1000)
+        resolver = ResolverStub(args.dns_ms / 1000)
+        socket.getaddrinfo = resolver
+
+        urls = [f"https://{STAND_IN_HOSTS[i % len(STAND_IN_HOSTS)]}:{server.port}/article/{i}"
+                for i in range(args.requests)]
+        results = [
+            run_mode("requests (HTTP/1.1)", NetworkGuard(), urls, args.concurrency, server, resolver),
+            run_mode("httpx (HTTP/2 + DNS cache)", NetworkGuard(http2=True, http2_hosts=STAND_IN_HOSTS),
+                     urls, args.concurrency, server, resolver),
+        ]
+
+    print(f"\n요청 {args.requests}건 x 호스트 {len(STAND_IN_HOSTS)}개, 동시 {args.concurrency}, 본문 {args.body_kb}KiB, "
+          f"모의 지연 RTT {args.rtt_ms:g}ms / 연결 {args.handshake_ms:g}ms / DNS {args.dns_ms:g}ms")
+    print(f"{'mode':<28}{'ok':>6}{'total(s)':>10}{'p50(ms)':>10}{'p95(ms)':>10}{'sockets':>9}{'h2':>5}{'h1':>6}{'dns':>6}")
+    for r in results:
+        print(f"{r['mode']:<28}{r['ok']:>6}{r['elapsed']:>10.2f}{r['p50']:>10.1f}{r['p95']:>10.1f}"
+              f"{r['sockets']:>9}{r['h2']:>5}{r['http1']:>6}{r['dns']:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+import os
+import re
+import sys
+import argparse
+import statistics
+import subprocess
+from typing import Dict, List, Tuple
+
+# 엔트리포인트 import만으로 로드되면 안 되는 무거운 의존성 (첫 사용 시점에 로드)
+HEAVY_MODULES = ("trafilatura", "bs4", "lxml", "requests", "urllib3", "googlenewsdecoder",
+                 "undetected_chromedriver", "selenium", "pyarrow", "pandas",
+                 "httpx", "httpcore", "h2")
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_LINE_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def measure(module: str) -> List[Tuple[str, int, int]]:
+    """새 인터프리터에서 `-X importtime`으로 module을 import하고 (모듈, self μs, 누적 μs) 목록 반환"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        m = _LINE_RE.match(line)
+        if m:
+            rows.append((m.group(4), int(m.group(1)), int(m.group(2))))
+    return rows
+
+
+def top_level(rows: List[Tuple[str, int, int]]) -> Dict[str, int]:
+    """최상위 패키지별 누적 시간 (μs)"""
+    totals: Dict[str, int] = {}
+    for name, self_us, _ in rows:
+        root = name.split(".")[0]
+        totals[root] = totals.get(root, 0) + self_us
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description="엔트리포인트 import 시간 벤치마크 (-X importtime)")
+    parser.add_argument("--module", default="main", help="측정할 엔트리포인트 모듈")
+    parser.add_argument("--runs", type=int, default=10, help="반복 횟수 (중앙값 보고)")
+    parser.add_argument("--top", type=int, default=15, help="출력할 상위 패키지 수")
+    parser.add_argument("--check", action="store_true", help="무거운 의존성이 import 시점에 로드되면 실패(exit 1)")
+    args = parser.parse_args()
+
+    # 첫 실행은 .pyc 생성 비용이 섞이므로 제외
+    measure(args.module)
+    totals, runs = [], []
+    for _ in range(args.runs):
+        rows = measure(args.module)
+        runs.append(rows)
+        totals.append(next(cum for name, _, cum in rows if name == args.module))
+
+    print(f"[{args.module}] import 누적 시간 ({args.runs}회): "
+          f"중앙값 {statistics.median(totals) / 1000:.1f}ms, 최소 {min(totals) / 1000:.1f}ms, 최대 {max(totals) / 1000:.1f}ms")
+
+    per_package = top_level(runs[-1])
+    print(f"\n상위 {args.top}개 패키지 (self 시간 합계, 마지막 실행 기준):")
+    for name, us in sorted(per_package.items(), key=lambda kv: kv[1], reverse=True)[:args.top]:
+        print(f"  {us / 1000:8.1f}ms  {name}")
+
+    loaded = sorted({name.split(".")[0] for name, _, _ in runs[-1]} & set(HEAVY_MODULES))
+    print(f"\nimport 시점에 로드된 무거운 의존성: {', '.join(loaded) if loaded else '없음'}")
+    if args.check and loaded:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
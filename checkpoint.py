@@ -0,0 +1,183 @@
+import os
+import json
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MANIFEST_PATH = "database/news/checkpoints/run_manifest.json"
+
+
+class RunCheckpoint:
+    """
+    파이프라인 실행 단위 체크포인트 (run manifest).
+    소스별로 검색 결과(discovered), Google URL 디코딩 매핑(decoded),
+    수집 완료(completed)/실패(failed) 집합과 소스 완료 여부를 기록하여
+    중단된 실행을 검색·디코딩 재수행 없이 이어서 진행할 수 있게 합니다.
+    기사 단위 기록(디코딩·완료·실패)은 저널(JSONL)에 한 줄씩 덧붙이고, manifest 전체는
+    검색 결과 기록·소스 완료·실행 종료 시점에만 다시 써서 저널을 비웁니다 (압축).
+    manifest_path가 None이면 메모리에서만 동작합니다 (디스크 기록 없음).
+    """
+    def __init__(self, manifest_path: Optional[str] = None, resume: bool = False):
+        self.manifest_path = manifest_path
+        self.journal_path = f"{os.path.splitext(manifest_path)[0]}.journal.jsonl" if manifest_path else None
+        self._journal = None
+        # 병렬 크롤러 스레드의 기록(디코딩·완료·실패)과 manifest 직렬화가 겹치지 않도록 직렬화
+        self._lock = threading.RLock()
+        self.manifest = None
+        if manifest_path and resume:
+            self.manifest = self._load()
+        if self.manifest is None:
+            self.manifest = self._new_manifest()
+        # 재개 시 복원한 저널 내용도 manifest에 합쳐 저널을 비움
+        self.save()
+
+    def _new_manifest(self) -> Dict:
+        now = datetime.now().isoformat()
+        return {"run_id": datetime.now().strftime("%Y%m%d_%H%M%S"), "status": "running",
+                "started_at": now, "updated_at": now, "journal_seq": 0, "sources": {}}
+
+    def _load(self) -> Optional[Dict]:
+        if not os.path.exists(self.manifest_path):
+            logger.info(f"[Checkpoint] 재개할 체크포인트 없음 → 새 실행 시작")
+            return None
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"[Checkpoint] 체크포인트 손상, 새 실행 시작: {e}")
+            return None
+        if manifest.get("status") == "completed":
+            logger.info(f"[Checkpoint] 직전 실행({manifest.get('run_id')})이 이미 완료됨 → 새 실행 시작")
+            return None
+        self.manifest = manifest
+        replayed = self._replay_journal()
+        logger.info(f"[Checkpoint] 실행 {manifest.get('run_id')} 재개 "
+                    f"(소스 {len(manifest.get('sources', {}))}개 기록, 저널 {replayed}건 복원)")
+        return manifest
+
+    def _replay_journal(self) -> int:
+        """manifest 이후에 덧붙인 저널 항목을 적용. 중단으로 잘린 마지막 줄은 무시"""
+        if not os.path.exists(self.journal_path):
+            return 0
+        seq = self.manifest.get("journal_seq", 0)
+        replayed = 0
+        with open(self.journal_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                # 압축 직후 저널을 비우기 전에 중단된 경우, 이미 manifest에 반영된 이전 세대 항목은 건너뜀
+                if entry.get("seq") != seq:
+                    continue
+                self._apply(entry)
+                replayed += 1
+        return replayed
+
+    def save(self):
+        """
+        manifest 전체를 임시 파일에 쓴 뒤 os.replace로 교체하고 저널을 비움 (중단 시에도 manifest 손상 방지).
+        저널 세대(journal_seq)를 올려 교체 후 비우기 전에 중단되어도 이전 항목이 다시 적용되지 않게 합니다.
+        """
+        if not self.manifest_path:
+            return
+        with self._lock:
+            self.manifest["updated_at"] = datetime.now().isoformat()
+            self.manifest["journal_seq"] = self.manifest.get("journal_seq", 0) + 1
+            os.makedirs(os.path.dirname(self.manifest_path) or ".", exist_ok=True)
+            tmp_path = f"{self.manifest_path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.manifest, f, ensure_ascii=False)
+            os.replace(tmp_path, self.manifest_path)
+            if self._journal:
+                self._journal.close()
+            self._journal = open(self.journal_path, 'w', encoding='utf-8')
+
+    def _record(self, entry: Dict):
+        """기사 단위 기록: 메모리 manifest에 적용하고 저널에 한 줄 덧붙임"""
+        with self._lock:
+            self._apply(entry)
+            if self._journal:
+                self._journal.write(json.dumps({**entry, "seq": self.manifest["journal_seq"]}, ensure_ascii=False) + "\n")
+                self._journal.flush()
+
+    def _apply(self, entry: Dict):
+        state = self._source(entry["source"])
+        op = entry["op"]
+        if op == "decoded":
+            state["decoded"][entry["google_url"]] = entry["url"]
+        elif op == "completed":
+            state["completed"][entry["key"]] = entry["article"]
+            if entry["key"] in state["failed"]:
+                state["failed"].remove(entry["key"])
+        elif op == "failed":
+            if entry["key"] not in state["failed"]:
+                state["failed"].append(entry["key"])
+
+    def _source(self, source: str) -> Dict:
+        with self._lock:
+            return self.manifest["sources"].setdefault(source, self._source_defaults())
+
+    # --- 검색 단계 ---
+    def get_discovered(self, source: str, query: str) -> Optional[List]:
+        """동일 쿼리의 검색 결과가 기록되어 있으면 반환 (재검색 생략)"""
+        state = self._source(source)
+        if state["query"] != query:
+            return None
+        return state["discovered"]
+
+    def set_discovered(self, source: str, query: str, items: List):
+        with self._lock:
+            state = self._source(source)
+            if state["query"] != query:
+                # 쿼리가 바뀌었으면 이전 기록은 무효
+                self.manifest["sources"][source] = state = {**self._source_defaults(), "query": query}
+            state["discovered"] = items
+            self.save()
+
+    @staticmethod
+    def _source_defaults() -> Dict:
+        return {"query": None, "discovered": None, "decoded": {}, "completed": {}, "failed": [], "done": False}
+
+    # --- 디코딩 단계 ---
+    def get_decoded(self, source: str, google_url: str) -> Optional[str]:
+        return self._source(source)["decoded"].get(google_url)
+
+    def set_decoded(self, source: str, google_url: str, url: str):
+        self._record({"op": "decoded", "source": source, "google_url": google_url, "url": url})
+
+    # --- 수집 단계 ---
+    def is_completed(self, source: str, key: str) -> bool:
+        return key in self._source(source)["completed"]
+
+    def mark_completed(self, source: str, key: str, article: Dict):
+        self._record({"op": "completed", "source": source, "key": key,
+                      "article": {"url": article.get("url"), "title": article.get("title")}})
+
+    def mark_failed(self, source: str, key: str):
+        self._record({"op": "failed", "source": source, "key": key})
+
+    def completed_articles(self, source: str) -> List[Dict]:
+        """이전 실행 구간에서 완료된 기사의 url/title 목록"""
+        with self._lock:
+            return list(self._source(source)["completed"].values())
+
+    # --- 소스/실행 단위 ---
+    def is_source_done(self, source: str) -> bool:
+        return self._source(source)["done"]
+
+    def mark_source_done(self, source: str):
+        with self._lock:
+            self._source(source)["done"] = True
+            self.save()
+
+    def finish(self):
+        with self._lock:
+            self.manifest["status"] = "completed"
+            self.save()
+            if self._journal:
+                self._journal.close()
+                self._journal = None
@@ -0,0 +1,224 @@
+import time
+import logging
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
+from sot_guardian import SOTGuardian
+from network_guard import NetworkGuard
+from total_war_scraper import TotalWarScraper
+from checkpoint import RunCheckpoint
+from html_cache import HtmlCache
+
+logger = logging.getLogger(__name__)
+
+# 실패 기사 최대 재시도 라운드 수
+MAX_RETRY_ROUNDS = 3
+
+# fetch_article/crawl_article 반환값: HTML이 아닌 문서 (재시도해도 결과가 같으므로 실패가 아닌 최종 처리)
+NOT_HTML = object()
+
+
+class CrawlerBase:
+    """
+    모든 소스 크롤러가 공유하는 수집 엔진.
+    동시성, 재시도 라운드, URL/내용 중복 검사, Total War 폴백 승격, 체크포인트, 수집 지표를 담당하고
+    소스별 어댑터(서브클래스)는 검색(search_news), 본문 파싱(parse_article), 메타데이터만 정의합니다.
+
+    어댑터가 정의하는 항목:
+        SOURCE / WF_ID / LANG   : SOT 메타데이터 (SOURCE는 체크포인트 소스 식별자 겸용)
+        LOG_NAME                : 로그 태그
+        MIN_CONTENT_LENGTH      : 표준 수집 결과가 이보다 짧으면 Total War로 승격
+        search_news(query, day) : 수집 대상 item 목록 (URL 문자열 또는 메타데이터 dict).
+                                  day가 주어지면 해당 일자 기사만, 없으면 최근 1일
+        parse_article(html, item): {"title", "date", "content"} 또는 None.
+                                  인스턴스 상태에 의존하지 않는 classmethod (캐시 재추출 시 크롤러 생성 없이 호출)
+    """
+    SOURCE = "unknown"
+    WF_ID = "wf1"
+    LANG = "ko"
+    LOG_NAME = "Crawler"
+    MIN_CONTENT_LENGTH = 0
+
+    def __init__(self, sot_path: str = "database/news/news_sot.jsonl", total_war: TotalWarScraper = None,
+                 checkpoint: RunCheckpoint = None, max_workers: int = 1, html_cache: Optional[HtmlCache] = None,
+                 net_guard: Optional[NetworkGuard] = None):
+        self.guardian = SOTGuardian(sot_path)
+        # 주입 시 크롤러 간 연결 풀(HTTP/2 모드)과 DNS 캐시를 공유
+        self.net_guard = net_guard or NetworkGuard()
+        self.total_war = total_war or TotalWarScraper()
+        self.checkpoint = checkpoint or RunCheckpoint()
+        self.html_cache = html_cache
+        self.max_workers = max_workers
+        self.metrics = Counter()
+        # 브라우저(Total War), SOT 저장·결과 목록, 수집 지표는 스레드 간 직렬화 (체크포인트는 자체 잠금)
+        self._fallback_lock = threading.Lock()
+        self._state_lock = threading.Lock()
+        self._metrics_lock = threading.Lock()
+
+    def _count(self, key: str, n: int = 1):
+        with self._metrics_lock:
+            self.metrics[key] += n
+
+    def _get_headers(self) -> Dict:
+        return self.net_guard.get_rotated_headers()
+
+    # --- 어댑터 훅 ---
+    def search_news(self, query: str, day: Optional[date] = None) -> List[Any]:
+        raise NotImplementedError
+
+    @classmethod
+    def parse_article(cls, html: str, item: Any) -> Optional[Dict]:
+        raise NotImplementedError
+
+    def item_key(self, item: Any) -> str:
+        """체크포인트 기록용 item 식별자"""
+        return item if isinstance(item, str) else item.get('google_url', item.get('url', ''))
+
+    def resolve_url(self, item: Any) -> str:
+        """item에서 실제 기사 URL 산출 (Google은 디코딩 포함)"""
+        return item if isinstance(item, str) else item.get('url', '')
+
+    def build_fallback(self, tw_result: Dict, item: Any) -> Dict:
+        """Total War 결과를 기사 데이터로 변환. 일자 정보가 없으면 오늘 날짜"""
+        return {
+            "title": tw_result['title'],
+            "date": datetime.now().strftime("%Y-%m-%d"),
+            "content": tw_result['content'],
+        }
+
+    # --- 수집 엔진 ---
+    def _with_metadata(self, article_data: Dict, url: str) -> Dict:
+        return {**article_data, "url": url, "source": self.SOURCE, "wf_id": self.WF_ID, "lang": self.LANG}
+
+    def fetch_article(self, item: Any, url: Optional[str] = None):
+        """
+        표준 수집 → (짧거나 실패 시) Total War 순으로 저장 후보 기사를 만든다. SOT에는 쓰지 않음.
+        우선순위 순 후보 목록을 반환하며, 저장 측은 첫 번째로 저장에 성공한 후보를 채택한다.
+        빈 목록은 재시도 대상 실패, HTML이 아닌 문서는 NOT_HTML.
+        """
+        url = url or self.resolve_url(item)
+
+        # 1차 시도: 표준 고속 추출 (스트리밍 수집, Content-Type/크기 상한 적용)
+        page = self.net_guard.fetch_html(url, self._get_headers())
+        if page and page["html"] is None:
+            # PDF·동영상 등 HTML이 아닌 문서는 브라우저로도 기사 본문을 얻을 수 없으므로 폴백하지 않음
+            self._count("non_html")
+            return NOT_HTML
+
+        if page and self.html_cache is not None:
+            try:
+                self.html_cache.put(url, page["html"], self.SOURCE, item)
+            except Exception as e:
+                logger.warning(f"[{self.LOG_NAME}] HTML 캐시 저장 실패: {e}")
+
+        parsed = None
+        if page:
+            try:
+                parsed = self.parse_article(page["html"], item)
+            except Exception as e:
+                logger.warning(f"[{self.LOG_NAME}] 5. 본문 파싱 실패: {e}")
+
+        candidates = []
+        # 2차 시도: 실패 또는 임계값 미달 시 Total War 승격
+        if not parsed or len(parsed['content']) < self.MIN_CONTENT_LENGTH:
+            with self._fallback_lock:
+                tw_result = self.total_war.scrape_with_all_means(url)
+            if tw_result:
+                self._count("total_war")
+                candidates.append(self._with_metadata(self.build_fallback(tw_result, item), url))
+        elif parsed:
+            self._count("fast_path")
+
+        # 짧은 표준 추출 결과도 최후 후보로 유지
+        if parsed:
+            candidates.append(self._with_metadata(parsed, url))
+        return candidates
+
+    def crawl_article(self, item: Any):
+        """저장된 기사, 수집 실패·중복이면 None, HTML이 아닌 문서는 NOT_HTML"""
+        url = self.resolve_url(item)
+
+        # P1: URL 기반 조기 중복 검사 — 네트워크 요청 전에 차단
+        if self.guardian.is_url_known(url):
+            logger.info(f"[SOT Guardian] URL already in SOT, skipping: {url}")
+            self._count("skipped_known")
+            return None
+
+        candidates = self.fetch_article(item, url)
+        if candidates is NOT_HTML:
+            logger.info(f"[{self.LOG_NAME}] HTML이 아닌 문서, 재시도 제외: {url}")
+            return NOT_HTML
+
+        for article in candidates:
+            with self._state_lock:
+                saved = self.guardian.save_article(article)
+            if saved:
+                self._count("saved")
+                return article
+
+        logger.error(f"❌ [MISSION FAIL] {self.LOG_NAME} 수집 실패 (재시도 대상): {url}")
+        return None
+
+    def _crawl_and_checkpoint(self, item: Any, results: List[Dict]) -> bool:
+        """기사 1건 수집 후 결과를 체크포인트에 기록. 재시도가 필요 없으면 True"""
+        key = self.item_key(item)
+        article = self.crawl_article(item)
+        if article is NOT_HTML:
+            return True
+        with self._state_lock:
+            if article:
+                results.append(article)
+                self.checkpoint.mark_completed(self.SOURCE, key, article)
+                return True
+            if self.guardian.is_url_known(self.resolve_url(item)):
+                return True
+            self.checkpoint.mark_failed(self.SOURCE, key)
+            return False
+
+    def _crawl_batch(self, items: List[Any], results: List[Dict]) -> List[Any]:
+        """item 묶음을 수집하고 재시도가 필요한 item 목록을 반환 (max_workers > 1이면 스레드 병렬)"""
+        if self.max_workers <= 1:
+            return [item for item in items if not self._crawl_and_checkpoint(item, results)]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            done = list(pool.map(lambda item: self._crawl_and_checkpoint(item, results), items))
+        return [item for item, ok in zip(items, done) if not ok]
+
+    def run(self, query: str) -> List[Dict]:
+        """검색 → 1차 수집 → 실패 재시도. 이번 실행(체크포인트 복원 포함)에서 저장된 기사 목록 반환"""
+        if self.checkpoint.is_source_done(self.SOURCE):
+            logger.info(f"[{self.LOG_NAME}] 체크포인트상 이미 완료된 소스 → 건너뜀")
+            return self.checkpoint.completed_articles(self.SOURCE)
+
+        items = self.checkpoint.get_discovered(self.SOURCE, query)
+        if items is None:
+            items = self.search_news(query)
+            self.checkpoint.set_discovered(self.SOURCE, query, items)
+            logger.info(f"[{self.LOG_NAME}] 발견된 기사: {len(items)}개")
+        else:
+            logger.info(f"[{self.LOG_NAME}] 체크포인트에서 검색 결과 복원: {len(items)}개 (재검색 생략)")
+        self._count("discovered", len(items))
+
+        # 1차 수집 (체크포인트상 완료된 기사는 결과만 복원)
+        results = self.checkpoint.completed_articles(self.SOURCE)
+        pending = [item for item in items if not self.checkpoint.is_completed(self.SOURCE, self.item_key(item))]
+        failed = self._crawl_batch(pending, results)
+
+        # 실패 기사 재시도 (최대 MAX_RETRY_ROUNDS 라운드)
+        for round_num in range(1, MAX_RETRY_ROUNDS + 1):
+            if not failed:
+                break
+            logger.warning(f"🔄 [{self.LOG_NAME}] 재시도 라운드 {round_num}/{MAX_RETRY_ROUNDS}: {len(failed)}개 실패 기사")
+            time.sleep(5 * round_num)  # 라운드마다 대기 시간 증가
+            self._count("retried", len(failed))
+            failed = self._crawl_batch(failed, results)
+
+        self.checkpoint.mark_source_done(self.SOURCE)
+        self._count("failed", len(failed))
+        if failed:
+            logger.error(f"⚠️ [{self.LOG_NAME}] 최종 미수집 기사: {len(failed)}개")
+        else:
+            logger.info(f"✅ [{self.LOG_NAME}] 모든 기사 수집 완료")
+        logger.info(f"📊 [{self.LOG_NAME}] 수집 지표: {dict(self.metrics)}")
+        return results
@@ -0,0 +1,236 @@
+import os
+import time
+import socket
+import logging
+import argparse
+import multiprocessing
+from typing import Dict, List, Optional
+from naver_crawler import NaverNewsCrawler
+from google_crawler import GoogleNewsCrawler
+from google_en_crawler import GoogleEnNewsCrawler
+from crawler_base import CrawlerBase, NOT_HTML
+from sot_guardian import SOTGuardian
+from total_war_scraper import TotalWarScraper
+from work_queue import WorkQueue, DEFAULT_QUEUE_PATH, MAX_JOB_ATTEMPTS
+from html_cache import HtmlCache, DEFAULT_CACHE_DIR, DEFAULT_MAX_CACHE_BYTES
+from network_guard import NetworkGuard
+from sot_index import SOTIndex
+from translation_queue import TranslationHandoff
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
+logger = logging.getLogger(__name__)
+
+# 큐 작업의 source 값 → 어댑터 클래스
+SOURCE_ADAPTERS = {cls.SOURCE: cls for cls in (NaverNewsCrawler, GoogleNewsCrawler, GoogleEnNewsCrawler)}
+
+# 큐 폴링 주기 (초)
+POLL_INTERVAL = 2.0
+
+
+class Coordinator:
+    """
+    분산 수집 코디네이터. 검색과 Google URL 디코딩을 직접 수행해 기사 작업을 큐에 적재하고,
+    워커들이 돌려준 수집 결과를 SOTGuardian을 통해 한 곳에서 직렬화·중복 검사하여 저장합니다.
+    """
+    def __init__(self, queue_path: str = DEFAULT_QUEUE_PATH, sot_path: str = "database/news/news_sot.jsonl",
+                 total_war: TotalWarScraper = None, collect_stored: bool = True,
+                 net_guard: Optional[NetworkGuard] = None):
+        self.queue = WorkQueue(queue_path)
+        self.sot_path = sot_path
+        self.guardian = SOTGuardian(sot_path)
+        # SOT 저장은 코디네이터에서만 일어나므로 전문 색인도 여기서 갱신
+        self.index = SOTIndex().attach(self.guardian)
+        self.total_war = total_war or TotalWarScraper()
+        # 검색 어댑터 간 연결 풀(HTTP/2 모드)·DNS 캐시 공유
+        self.net_guard = net_guard or NetworkGuard()
+        # 대량 백필에서는 저장 기사 목록을 메모리에 쌓지 않고 건수만 집계
+        self.collect_stored = collect_stored
+        self.stored: List[Dict] = []
+        self.stored_count = 0
+
+    def discover(self, source: str, query: str) -> int:
+        """검색 → URL 해석(디코딩) → SOT 미수록 URL만 큐에 적재. 신규 적재 건수 반환"""
+        crawler = SOURCE_ADAPTERS[source](sot_path=self.sot_path, total_war=self.total_war, net_guard=self.net_guard)
+        return self.enqueue_items(crawler, crawler.search_news(query))
+
+    def enqueue_items(self, crawler: CrawlerBase, items: List, urls: Optional[List[str]] = None) -> int:
+        """
+        검색 결과 item의 URL을 해석(디코딩)하여 SOT 미수록 URL만 큐에 적재.
+        urls가 주어지면 이미 해석된 URL(item과 같은 순서)을 그대로 사용
+        """
+        enqueued = 0
+        for i, item in enumerate(items):
+            url = urls[i] if urls is not None else crawler.resolve_url(item)
+            if self.guardian.is_url_known(url):
+                continue
+            if self.queue.enqueue(crawler.SOURCE, url, item):
+                enqueued += 1
+        logger.info(f"[Coordinator] {crawler.LOG_NAME}: 발견 {len(items)}개 → 신규 작업 {enqueued}개 적재")
+        return enqueued
+
+    def drain_results(self) -> int:
+        """워커 결과를 SOT에 반영. 처리한 결과 수 반환"""
+        results = self.queue.pop_results()
+        for result in results:
+            saved = None
+            for article in result["candidates"]:
+                if self.guardian.save_article(article):
+                    saved = article
+                    break
+            if saved or self.guardian.is_url_known(result["url"]):
+                self.queue.mark_stored(result["id"])
+                if saved:
+                    self.stored_count += 1
+                    if self.collect_stored:
+                        self.stored.append({k: saved[k] for k in ("url", "title", "source", "wf_id")})
+            else:
+                self.queue.requeue(result["id"], "SOT 저장 거부")
+        return len(results)
+
+    def wait(self, workers: List[multiprocessing.Process]):
+        """큐가 비워질 때까지 결과를 반영. 로컬 워커가 모두 종료되었는데 작업이 남으면 중단"""
+        while True:
+            handled = self.drain_results()
+            if self.queue.is_drained():
+                break
+            if workers and not any(p.is_alive() for p in workers):
+                logger.error(f"[Coordinator] 로컬 워커가 모두 종료됨. 남은 작업: {self.queue.counts()}")
+                self.drain_results()
+                break
+            if not handled:
+                time.sleep(POLL_INTERVAL)
+        logger.info(f"[Coordinator] 큐 처리 완료: {self.queue.counts()} / 이번 실행 저장 {self.stored_count}건")
+
+    def close(self):
+        self.queue.close()
+        self.index.close()
+        self.total_war.close()
+        self.net_guard.close()
+
+
+def run_worker(queue_path: str = DEFAULT_QUEUE_PATH, sot_path: str = "database/news/news_sot.jsonl",
+               worker_id: Optional[str] = None, exit_when_drained: bool = True, http2: bool = False,
+               cache_dir: Optional[str] = DEFAULT_CACHE_DIR, cache_max_bytes: int = DEFAULT_MAX_CACHE_BYTES):
+    """
+    작업을 임대 → 어댑터의 fetch_article로 수집·추출 → 결과를 큐에 반환.
+    SOT에는 직접 쓰지 않으며, 공유 스토리지의 큐만 보이면 다른 호스트에서도 실행 가능합니다.
+    원본 HTML 캐시(cache_dir)는 WAL 인덱스를 쓰므로 호스트 로컬 디스크에 둡니다 (None이면 미사용).
+    """
+    worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+    queue = WorkQueue(queue_path)
+    total_war = TotalWarScraper()  # 워커마다 자체 브라우저 (lazy init)
+    html_cache = HtmlCache(cache_dir, cache_max_bytes) if cache_dir else None
+    net_guard = NetworkGuard(http2=http2)  # 소스 어댑터 간 연결 풀·DNS 캐시 공유
+    crawlers: Dict[str, CrawlerBase] = {}
+    processed = 0
+    logger.info(f"[Worker {worker_id}] 가동")
+    try:
+        while True:
+            job = queue.lease(worker_id)
+            if job is None:
+                if exit_when_drained and queue.is_drained():
+                    break
+                time.sleep(POLL_INTERVAL)
+                continue
+
+            crawler = crawlers.get(job["source"])
+            if crawler is None:
+                crawler = crawlers[job["source"]] = SOURCE_ADAPTERS[job["source"]](
+                    sot_path=sot_path, total_war=total_war, html_cache=html_cache, net_guard=net_guard)
+            if crawler.guardian.is_url_known(job["url"]):
+                # 적재 이후 SOT에 수록된 URL: 네트워크 요청 없이 빈 결과로 종결 (코디네이터가 수록 확인 후 stored 처리)
+                logger.info(f"[SOT Guardian] URL already in SOT, skipping: {job['url']}")
+                queue.complete(job["id"], worker_id, [])
+                processed += 1
+                continue
+            try:
+                candidates = crawler.fetch_article(job["item"], job["url"])
+            except Exception as e:
+                logger.error(f"[Worker {worker_id}] 7. 예외 발생: {e} | URL: {job['url']}")
+                candidates = []
+
+            if candidates is NOT_HTML:
+                # 재시도해도 같은 결과이므로 재적재하지 않고 최종 실패로 종결
+                reported = queue.fail(job["id"], worker_id, "HTML 아님", MAX_JOB_ATTEMPTS)
+            elif candidates:
+                reported = queue.complete(job["id"], worker_id, candidates)
+            else:
+                logger.error(f"❌ [MISSION FAIL] {crawler.LOG_NAME} 수집 실패 ({job['attempts']}회차): {job['url']}")
+                reported = queue.fail(job["id"], worker_id, "수집 실패", job["attempts"])
+            if not reported:
+                logger.warning(f"[Worker {worker_id}] 임대 만료로 다른 워커에 넘어간 작업, 결과 폐기: {job['url']}")
+            processed += 1
+    finally:
+        total_war.close()
+        if html_cache is not None:
+            html_cache.close()
+        net_guard.close()
+        queue.close()
+        logger.info(f"[Worker {worker_id}] 종료 (처리 {processed}건)")
+
+
+def run_coordinator(num_workers: int, queue_path: str = DEFAULT_QUEUE_PATH, http2: bool = False) -> List[Dict]:
+    """검색·적재 → 로컬 워커 N개 가동 → 결과 반영. num_workers=0이면 외부 워커만 사용"""
+    from main import QUERY_KO, QUERY_EN, SOT_PATH
+
+    os.makedirs(os.path.dirname(SOT_PATH), exist_ok=True)
+    coordinator = Coordinator(queue_path, SOT_PATH, net_guard=NetworkGuard(http2=http2))
+    workers: List[multiprocessing.Process] = []
+    try:
+        # 적재 중 표시: 검색·디코딩 동안 먼저 뜬 외부 워커가 빈 큐를 보고 종료하지 않음
+        coordinator.queue.set_discovering(True)
+        coordinator.discover(NaverNewsCrawler.SOURCE, QUERY_KO)
+        coordinator.discover(GoogleNewsCrawler.SOURCE, QUERY_KO)
+        coordinator.discover(GoogleEnNewsCrawler.SOURCE, QUERY_EN)
+        coordinator.queue.set_discovering(False)
+
+        # 브라우저/이벤트 루프를 공유하지 않도록 spawn으로 독립 프로세스 생성
+        ctx = multiprocessing.get_context("spawn")
+        for i in range(num_workers):
+            p = ctx.Process(target=run_worker, args=(queue_path, SOT_PATH, f"{socket.gethostname()}:local{i}", True, http2))
+            p.start()
+            workers.append(p)
+        logger.info(f"[Coordinator] 로컬 워커 {num_workers}개 가동, 큐: {queue_path}")
+
+        coordinator.wait(workers)
+
+        en_articles = [art for art in coordinator.stored if art["wf_id"] == "wf2"]
+        for art in en_articles:
+            print(f"TRANSLATION_REQUIRED: {art['url']}|{art['title']}")
+        if en_articles:
+            handoff_path = TranslationHandoff(SOT_PATH, coordinator.index).write(en_articles)
+            if handoff_path:
+                print(f"TRANSLATION_HANDOFF: {handoff_path}")
+    finally:
+        coordinator.queue.set_discovering(False)
+        for p in workers:
+            p.join()
+        coordinator.close()
+    return coordinator.stored
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="분산 수집 모드 (코디네이터/워커)")
+    sub = parser.add_subparsers(dest="role", required=True)
+
+    coord = sub.add_parser("coordinator", help="검색·적재 후 결과를 SOT에 직렬 저장")
+    coord.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="함께 띄울 로컬 워커 수 (0이면 외부 워커만)")
+    coord.add_argument("--queue", default=DEFAULT_QUEUE_PATH, help="작업 큐 SQLite 경로 (공유 스토리지)")
+    coord.add_argument("--http2", action="store_true", help="검색 요청과 로컬 워커에 HTTP/2 다중화 + DNS 캐시 사용")
+
+    worker = sub.add_parser("worker", help="큐에서 작업을 가져와 수집·추출")
+    worker.add_argument("--queue", default=DEFAULT_QUEUE_PATH, help="작업 큐 SQLite 경로 (공유 스토리지)")
+    worker.add_argument("--sot", default="database/news/news_sot.jsonl", help="SOT 경로 (URL 조기 중복 검사용)")
+    worker.add_argument("--forever", action="store_true", help="큐가 비어도 종료하지 않고 계속 대기")
+    worker.add_argument("--http2", action="store_true", help="고빈도 호스트 요청에 HTTP/2 다중화 + DNS 캐시 사용")
+    worker.add_argument("--cache", default=DEFAULT_CACHE_DIR, help="원본 HTML 캐시 디렉터리 (호스트 로컬 디스크)")
+    worker.add_argument("--cache-max-bytes", type=int, default=DEFAULT_MAX_CACHE_BYTES,
+                        help="원본 HTML 캐시 총량 상한 (압축 후 바이트, 기본 1GiB)")
+    worker.add_argument("--no-cache", action="store_true", help="원본 HTML 캐시를 사용하지 않음")
+
+    args = parser.parse_args()
+    if args.role == "coordinator":
+        run_coordinator(args.workers, args.queue, http2=args.http2)
+    else:
+        run_worker(args.queue, args.sot, exit_when_drained=not args.forever, http2=args.http2,
+                   cache_dir=None if args.no_cache else args.cache, cache_max_bytes=args.cache_max_bytes)
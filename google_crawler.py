@@ -1,34 +1,35 @@
-import os
-import json
 import logging
 import base64
 import re
-import time
-from datetime import datetime, timedelta
-from bs4 import BeautifulSoup
-import trafilatura
+from datetime import date, datetime, timedelta
 from typing import List, Dict, Optional
-from sot_guardian import SOTGuardian
-from network_guard import NetworkGuard
-from total_war_scraper import TotalWarScraper
+from crawler_base import CrawlerBase
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
 logger = logging.getLogger(__name__)
 
-# 실패 기사 최대 재시도 라운드 수
-MAX_RETRY_ROUNDS = 3
 
-
-class GoogleNewsCrawler:
-    def __init__(self, sot_path: str = "database/news/news_sot.jsonl", total_war: TotalWarScraper = None):
-        self.guardian = SOTGuardian(sot_path)
-        self.net_guard = NetworkGuard()
-        self.total_war = total_war or TotalWarScraper()
-
-    def _get_headers(self) -> Dict:
-        return self.net_guard.get_rotated_headers()
+class GoogleNewsCrawler(CrawlerBase):
+    """구글 뉴스 어댑터(한국어): RSS 검색 → 웹 폴백, Google URL 디코딩, trafilatura 본문 추출"""
+    SOURCE = "google"
+    WF_ID = "wf1"
+    LANG = "ko"
+    LOG_NAME = "Google"
+    MIN_CONTENT_LENGTH = 300
+    RSS_LOCALE = "hl=ko&gl=KR&ceid=KR:ko"
 
     def decode_url(self, google_url: str) -> str:
+        """체크포인트의 디코딩 매핑을 우선 조회하고, 없을 때만 실제 디코딩 수행"""
+        cached = self.checkpoint.get_decoded(self.SOURCE, google_url)
+        if cached:
+            return cached
+        url = self._decode_url(google_url)
+        # 실패(원래 URL 반환)는 일시적일 수 있으므로 기록하지 않고 재시도 때 다시 디코딩
+        if url != google_url:
+            self.checkpoint.set_decoded(self.SOURCE, google_url, url)
+        return url
+
+    def _decode_url(self, google_url: str) -> str:
         """2-tier Google News URL 디코딩: protobuf 파싱 → googlenewsdecoder 폴백"""
         # Tier A: 오프라인 protobuf 파싱
         try:
@@ -77,7 +78,7 @@ class GoogleNewsCrawler:
                     break
             if urls:
                 result = max(urls, key=len)
-                logger.info(f"[Google] Protobuf 디코딩 성공: {result[:60]}...")
+                logger.info(f"[{self.LOG_NAME}] Protobuf 디코딩 성공: {result[:60]}...")
                 return result
         except Exception:
             pass
@@ -87,51 +88,73 @@ class GoogleNewsCrawler:
             from googlenewsdecoder import new_decoderv1
             decoded = new_decoderv1(google_url, interval=1)
             if decoded and decoded.get("decoded_url"):
-                logger.info(f"[Google] googlenewsdecoder 성공: {decoded['decoded_url'][:60]}...")
+                logger.info(f"[{self.LOG_NAME}] googlenewsdecoder 성공: {decoded['decoded_url'][:60]}...")
                 return decoded["decoded_url"]
         except Exception as e:
-            logger.warning(f"[Google] googlenewsdecoder 실패: {e}")
+            logger.warning(f"[{self.LOG_NAME}] googlenewsdecoder 실패: {e}")
 
         return google_url
 
-    def search_news(self, query: str) -> List[Dict]:
+    def search_news(self, query: str, day: Optional[date] = None) -> List[Dict]:
         """RSS 기반 검색 → 실패 시 웹 크롤링 폴백"""
-        articles = self._search_via_rss(query)
+        articles = self._search_via_rss(query, day)
         if not articles:
-            logger.warning("[Google] RSS 수집 실패 → 웹 크롤링 폴백 가동")
-            articles = self._search_via_web(query)
+            logger.warning(f"[{self.LOG_NAME}] RSS 수집 실패 → 웹 크롤링 폴백 가동")
+            articles = self._search_via_web(query, day)
         return articles
 
-    def _search_via_rss(self, query: str) -> List[Dict]:
-        search_url = f"https://news.google.com/rss/search?q={query}+when:1d&hl=ko&gl=KR&ceid=KR:ko"
+    @staticmethod
+    def _news_period(day: Optional[date]) -> str:
+        """Google News 검색 연산자: 최근 1일(when:1d) 또는 특정 일자(after/before)"""
+        if not day:
+            return "when:1d"
+        return f"after:{day:%Y-%m-%d}+before:{day + timedelta(days=1):%Y-%m-%d}"
+
+    @staticmethod
+    def _web_period(day: Optional[date]) -> str:
+        """Google 검색 tbs 파라미터: 최근 1일(qdr:d) 또는 특정 일자(cdr)"""
+        if not day:
+            return "qdr:d"
+        return f"cdr:1,cd_min:{day.month}/{day.day}/{day.year},cd_max:{day.month}/{day.day}/{day.year}"
+
+    def _search_via_rss(self, query: str, day: Optional[date] = None) -> List[Dict]:
+        search_url = f"https://news.google.com/rss/search?q={query}+{self._news_period(day)}&{self.RSS_LOCALE}"
         response = self.net_guard.robust_request(search_url, self._get_headers())
 
         articles = []
         if response:
             try:
+                from bs4 import BeautifulSoup
                 soup = BeautifulSoup(response.text, 'xml')
                 for item in soup.select("item"):
                     articles.append({"title": item.title.text, "google_url": item.link.text, "date": item.pubDate.text})
             except Exception as e:
-                logger.error(f"[Google] RSS 파싱 실패: {e}")
+                logger.error(f"[{self.LOG_NAME}] RSS 파싱 실패: {e}")
         return articles
 
-    def _search_via_web(self, query: str) -> List[Dict]:
-        """RSS 실패 시 Google News 웹 페이지 직접 크롤링"""
-        search_url = f"https://news.google.com/search?q={query}+when:1d&hl=ko&gl=KR&ceid=KR:ko"
-        tw_result = self.total_war.scrape_with_all_means(search_url)
+    def _search_via_web(self, query: str, day: Optional[date] = None) -> List[Dict]:
+        """RSS 실패 시 Google News 웹 페이지 직접 크롤링 (일자 지정 검색은 브라우저 없이 Google 검색만)"""
+        tw_result = None
+        if day is None:
+            # 기간 백필은 일자 샤드마다 검색하므로 샤드별 브라우저 가동을 피함
+            search_url = f"https://news.google.com/search?q={query}+{self._news_period(day)}&{self.RSS_LOCALE}"
+            tw_result = self.total_war.scrape_with_all_means(search_url)
         if not tw_result:
             # Total War도 실패 시 일반 Google 검색으로 폴백
-            search_url = f"https://www.google.com/search?q={query}&tbm=nws&tbs=qdr:d"
+            search_url = f"https://www.google.com/search?q={query}&tbm=nws&tbs={self._web_period(day)}"
             response = self.net_guard.robust_request(search_url, self._get_headers())
             if not response:
                 return []
             html = response.text
         else:
             return []  # Total War은 page_source를 반환하지 않으므로, 아래 로직으로 진행
+        return self._parse_web_results(html)
 
+    def _parse_web_results(self, html: str) -> List[Dict]:
+        """Google 검색 결과 HTML에서 /url?q= 링크의 실제 기사 URL과 제목 추출"""
         articles = []
         try:
+            from bs4 import BeautifulSoup
             soup = BeautifulSoup(html, 'lxml')
             for link in soup.select("a[href*='/url?']"):
                 href = link.get("href", "")
@@ -145,71 +168,27 @@ class GoogleNewsCrawler:
                             "google_url": real_url,
                             "date": datetime.now().strftime("%Y-%m-%d")
                         })
-            logger.info(f"[Google] 웹 크롤링 폴백으로 {len(articles)}개 기사 발견")
+            logger.info(f"[{self.LOG_NAME}] 웹 크롤링 폴백으로 {len(articles)}개 기사 발견")
         except Exception as e:
-            logger.error(f"[Google] 웹 크롤링 폴백 파싱 실패: {e}")
+            logger.error(f"[{self.LOG_NAME}] 웹 크롤링 폴백 파싱 실패: {e}")
         return articles
 
-    def crawl_article(self, info: Dict) -> Optional[Dict]:
+    def item_key(self, info: Dict) -> str:
+        return info.get('google_url', '')
+
+    def resolve_url(self, info: Dict) -> str:
         # google_url이 이미 실제 URL인 경우 (웹 크롤링 폴백) decode 불필요
         if 'google_url' in info and 'news.google.com' in info['google_url']:
-            url = self.decode_url(info['google_url'])
-        else:
-            url = info.get('google_url', info.get('url', ''))
-
-        # P1: URL 기반 조기 중복 검사 — 네트워크 요청 전에 차단
-        if self.guardian.is_url_known(url):
-            logger.info(f"[SOT Guardian] URL already in SOT, skipping: {url}")
+            return self.decode_url(info['google_url'])
+        return info.get('google_url', info.get('url', ''))
+
+    @classmethod
+    def parse_article(cls, html: str, info: Dict) -> Optional[Dict]:
+        import trafilatura
+        content = trafilatura.extract(html)
+        if not content:
             return None
+        return {"title": info['title'], "date": info['date'], "content": content}
 
-        # 1차 시도: 표준 고속 추출
-        response = self.net_guard.robust_request(url, self._get_headers())
-        content = trafilatura.extract(response.text) if response else None
-
-        # 2차 시도: 실패 시 Total War 가동
-        if not content or len(content) < 300:
-            tw_result = self.total_war.scrape_with_all_means(url)
-            if tw_result:
-                article = {
-                    "title": tw_result['title'], "date": info['date'], "content": tw_result['content'],
-                    "url": url, "source": "google", "wf_id": "wf1", "lang": "ko"
-                }
-                if self.guardian.save_article(article): return article
-
-        if content:
-            article = {"title": info['title'], "date": info['date'], "content": content, "url": url, "source": "google", "wf_id": "wf1", "lang": "ko"}
-            if self.guardian.save_article(article): return article
-
-        logger.error(f"❌ [MISSION FAIL] Google 수집 실패 (재시도 대상): {url}")
-        return None
-
-    def run(self, query: str):
-        articles = self.search_news(query)
-        logger.info(f"[Google] 발견된 기사: {len(articles)}개")
-
-        # 1차 수집
-        failed_infos = []
-        for info in articles:
-            result = self.crawl_article(info)
-            url = self.decode_url(info.get('google_url', ''))
-            if result is None and not self.guardian.is_url_known(url):
-                failed_infos.append(info)
-
-        # 실패 기사 재시도 (최대 MAX_RETRY_ROUNDS 라운드)
-        for round_num in range(1, MAX_RETRY_ROUNDS + 1):
-            if not failed_infos:
-                break
-            logger.warning(f"🔄 [Google] 재시도 라운드 {round_num}/{MAX_RETRY_ROUNDS}: {len(failed_infos)}개 실패 기사")
-            time.sleep(5 * round_num)
-            still_failed = []
-            for info in failed_infos:
-                result = self.crawl_article(info)
-                url = self.decode_url(info.get('google_url', ''))
-                if result is None and not self.guardian.is_url_known(url):
-                    still_failed.append(info)
-            failed_infos = still_failed
-
-        if failed_infos:
-            logger.error(f"⚠️ [Google] 최종 미수집 기사: {len(failed_infos)}개")
-        else:
-            logger.info(f"✅ [Google] 모든 기사 수집 완료")
+    def build_fallback(self, tw_result: Dict, info: Dict) -> Dict:
+        return {"title": tw_result['title'], "date": info['date'], "content": tw_result['content']}
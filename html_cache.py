@@ -0,0 +1,193 @@
+import os
+import gzip
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from typing import Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = "database/news/html_cache"
+# 압축 후 기준 캐시 총량 상한 (초과 시 가장 오래전에 저장된 페이지부터 제거)
+DEFAULT_MAX_CACHE_BYTES = 1024 * 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    url         TEXT PRIMARY KEY,
+    digest      TEXT NOT NULL,
+    source      TEXT NOT NULL,
+    item        TEXT NOT NULL,
+    stored_at   REAL NOT NULL,
+    accessed_at REAL NOT NULL  -- 이전 버전 호환용 (stored_at과 같은 값으로 기록)
+);
+CREATE INDEX IF NOT EXISTS idx_pages_stored ON pages(stored_at);
+CREATE INDEX IF NOT EXISTS idx_pages_digest ON pages(digest);
+CREATE TABLE IF NOT EXISTS blobs (
+    digest TEXT PRIMARY KEY,
+    size   INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+class HtmlCache:
+    """
+    수집한 원본 HTML의 압축 저장소. 본문은 내용 해시(SHA-256)로 주소화한 gzip blob으로 한 번만 저장하고,
+    URL → blob 매핑과 검색 당시 item(메타데이터)을 SQLite 인덱스에 기록합니다.
+    총량이 max_bytes를 넘으면 저장 시각이 가장 오래된 페이지부터(같은 URL을 다시 저장하면 갱신) 상한 이하가 될 때까지
+    제거하며, 참조가 사라진 blob은 삭제합니다. 캐시는 재추출용 보관소이므로 읽기는 순서에 영향을 주지 않습니다.
+    총량은 blob 추가·삭제 시 meta 테이블에서 함께 갱신하여 저장마다 전체 합계를 다시 계산하지 않습니다.
+    추출 로직 변경 시 reextract.py가 이 캐시에서 네트워크 없이 SOT 레코드를 재구성합니다.
+    인덱스는 WAL 모드이므로 root는 호스트 로컬 디스크에 두어야 합니다 (공유 스토리지 불가).
+    """
+    def __init__(self, root: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_CACHE_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        os.makedirs(os.path.join(root, "blobs"), exist_ok=True)
+        # 크롤러 스레드 간 공유되므로 연결 하나를 잠금으로 직렬화
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(os.path.join(root, "index.sqlite"), timeout=30,
+                                    isolation_level=None, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA busy_timeout=30000")
+        self.conn.executescript(_SCHEMA)
+        # 이전 버전 캐시(총량 기록 없음)는 최초 1회만 합계 계산
+        self.conn.execute(
+            "INSERT OR IGNORE INTO meta (key, value) SELECT 'total_bytes', COALESCE(SUM(size), 0) FROM blobs"
+        )
+
+    def close(self):
+        self.conn.close()
+
+    @staticmethod
+    def blob_path(root: str, digest: str) -> str:
+        return os.path.join(root, "blobs", digest[:2], f"{digest}.html.gz")
+
+    @staticmethod
+    def read_blob(root: str, digest: str) -> Optional[str]:
+        """blob 파일을 직접 읽음 (인덱스 연결 없이 다른 프로세스에서도 사용 가능)"""
+        try:
+            with gzip.open(HtmlCache.blob_path(root, digest), 'rb') as f:
+                return f.read().decode('utf-8')
+        except OSError:
+            return None
+
+    def put(self, url: str, html: str, source: str, item) -> str:
+        """페이지 저장 후 blob 해시 반환. 동일 내용은 blob을 공유"""
+        data = html.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.blob_path(self.root, digest)
+        now = time.time()
+
+        with self._lock:
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with gzip.open(tmp_path, 'wb', compresslevel=6) as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                size = os.path.getsize(path)
+                if self.conn.execute(
+                    "INSERT OR IGNORE INTO blobs (digest, size) VALUES (?, ?)", (digest, size)
+                ).rowcount:
+                    self._add_bytes(size)
+                previous = self.conn.execute("SELECT digest FROM pages WHERE url = ?", (url,)).fetchone()
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO pages (url, digest, source, item, stored_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (url, digest, source, json.dumps(item, ensure_ascii=False), now, now),
+                )
+                orphans = self._drop_orphans([previous[0]]) if previous and previous[0] != digest else []
+                orphans += self._evict(keep_url=url)
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+        self._remove_blob_files(orphans)
+        return digest
+
+    def lookup(self, url: str) -> Optional[Dict]:
+        """URL의 캐시 항목(digest, source, item) 조회"""
+        with self._lock:
+            row = self.conn.execute("SELECT digest, source, item FROM pages WHERE url = ?", (url,)).fetchone()
+        if row is None:
+            return None
+        return {"url": url, "digest": row[0], "source": row[1], "item": json.loads(row[2])}
+
+    def entries(self, batch_size: int = 1000) -> Iterator[Dict]:
+        """전체 캐시 항목(url, digest, source, item)을 배치 단위로 순회 (메모리 일정)"""
+        last_url = ""
+        while True:
+            with self._lock:
+                rows = self.conn.execute(
+                    "SELECT url, digest, source, item FROM pages WHERE url > ? ORDER BY url LIMIT ?",
+                    (last_url, batch_size),
+                ).fetchall()
+            if not rows:
+                return
+            for url, digest, source, item in rows:
+                yield {"url": url, "digest": digest, "source": source, "item": json.loads(item)}
+            last_url = rows[-1][0]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            pages = self.conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+            blobs = self.conn.execute("SELECT COUNT(*) FROM blobs").fetchone()[0]
+            size = self._total_bytes()
+        return {"pages": pages, "blobs": blobs, "bytes": size, "max_bytes": self.max_bytes}
+
+    # --- 총량 기록 / 오래된 페이지 제거 (트랜잭션 내부에서 호출) ---
+    def _total_bytes(self) -> int:
+        return self.conn.execute("SELECT value FROM meta WHERE key = 'total_bytes'").fetchone()[0]
+
+    def _add_bytes(self, delta: int):
+        self.conn.execute("UPDATE meta SET value = value + ? WHERE key = 'total_bytes'", (delta,))
+
+    def _evict(self, keep_url: str) -> list:
+        """상한 이하가 될 때까지 가장 오래전에 저장된 페이지부터 제거. 방금 저장한 keep_url은 제외"""
+        total = self._total_bytes()
+        removed = []
+        evicted_pages = 0
+        while total > self.max_bytes:
+            rows = self.conn.execute(
+                "SELECT url, digest FROM pages WHERE url != ? ORDER BY stored_at LIMIT 100", (keep_url,)
+            ).fetchall()
+            if not rows:
+                break
+            for url, digest in rows:
+                self.conn.execute("DELETE FROM pages WHERE url = ?", (url,))
+                evicted_pages += 1
+                removed += self._drop_orphans([digest])
+                total = self._total_bytes()
+                if total <= self.max_bytes:
+                    break
+        if evicted_pages:
+            logger.info(f"[HtmlCache] 용량 상한 초과 → 오래된 페이지 제거 {evicted_pages}페이지 / blob {len(removed)}개")
+        return removed
+
+    def _drop_orphans(self, digests) -> list:
+        """어떤 페이지도 참조하지 않는 blob을 인덱스에서 제거하고 목록 반환"""
+        orphans = []
+        for digest in digests:
+            if self.conn.execute("SELECT 1 FROM pages WHERE digest = ? LIMIT 1", (digest,)).fetchone() is None:
+                row = self.conn.execute("SELECT size FROM blobs WHERE digest = ?", (digest,)).fetchone()
+                if row:
+                    self.conn.execute("DELETE FROM blobs WHERE digest = ?", (digest,))
+                    self._add_bytes(-row[0])
+                orphans.append(digest)
+        return orphans
+
+    def _remove_blob_files(self, digests):
+        for digest in digests:
+            try:
+                os.remove(self.blob_path(self.root, digest))
+            except OSError:
+                pass
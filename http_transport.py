@@ -0,0 +1,156 @@
+import time
+import socket
+import logging
+import threading
+import contextlib
+import urllib.request
+from typing import Dict, Iterable, Iterator, List, Tuple
+import httpcore
+import httpx
+from network_guard import DEFAULT_DNS_TTL
+
+logger = logging.getLogger(__name__)
+
+# 호스트당 연결 수 상한 (HTTP/2는 연결 하나에 요청을 다중화하므로 작게 유지)
+HTTP2_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=60.0)
+REQUEST_TIMEOUT = 15.0
+
+
+class DNSCache:
+    """
+    프로세스 내 DNS 캐시. (호스트, 포트) → 주소 목록을 TTL 동안 재사용합니다.
+    모든 주소로의 연결이 실패하면 해당 항목을 무효화하여 다음 요청에서 다시 해석합니다.
+    """
+    def __init__(self, ttl: float = DEFAULT_DNS_TTL):
+        self.ttl = ttl
+        self._entries: Dict[Tuple[str, int], Tuple[float, List[str]]] = {}
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.hits = 0
+
+    def resolve(self, host: str, port: int) -> List[str]:
+        key = (host, port)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > now:
+                self.hits += 1
+                return entry[1]
+        infos = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        with self._lock:
+            self.lookups += 1
+            self._entries[key] = (now + self.ttl, addresses)
+        return addresses
+
+    def invalidate(self, host: str, port: int):
+        with self._lock:
+            self._entries.pop((host, port), None)
+
+
+class _DNSCachingBackend(httpcore.SyncBackend):
+    """호스트명을 DNSCache로 해석한 뒤 주소로 직접 연결 (TLS SNI·인증서 검증은 원래 호스트명 사용)"""
+    def __init__(self, dns_cache: DNSCache):
+        self.dns_cache = dns_cache
+
+    def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        last_error = None
+        for address in self.dns_cache.resolve(host, port):
+            try:
+                return super().connect_tcp(address, port, timeout, local_address, socket_options)
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                last_error = e
+        self.dns_cache.invalidate(host, port)
+        raise last_error or httpcore.ConnectError(f"주소 해석 결과 없음: {host}")
+
+
+# httpcore 예외 → httpx 공개 예외 (NetworkGuard와 호출 측은 httpx 예외만 처리)
+_EXCEPTION_MAP = (
+    (httpcore.ConnectTimeout, httpx.ConnectTimeout),
+    (httpcore.ReadTimeout, httpx.ReadTimeout),
+    (httpcore.WriteTimeout, httpx.WriteTimeout),
+    (httpcore.PoolTimeout, httpx.PoolTimeout),
+    (httpcore.TimeoutException, httpx.TimeoutException),
+    (httpcore.ConnectError, httpx.ConnectError),
+    (httpcore.ReadError, httpx.ReadError),
+    (httpcore.WriteError, httpx.WriteError),
+    (httpcore.NetworkError, httpx.NetworkError),
+    (httpcore.RemoteProtocolError, httpx.RemoteProtocolError),
+    (httpcore.LocalProtocolError, httpx.LocalProtocolError),
+    (httpcore.UnsupportedProtocol, httpx.UnsupportedProtocol),
+    (httpcore.ProtocolError, httpx.ProtocolError),
+)
+
+
+@contextlib.contextmanager
+def _map_exceptions():
+    try:
+        yield
+    except Exception as e:
+        for source, target in _EXCEPTION_MAP:
+            if isinstance(e, source):
+                raise target(str(e)) from e
+        raise
+
+
+class _ResponseStream(httpx.SyncByteStream):
+    def __init__(self, stream: Iterable[bytes]):
+        self._stream = stream
+
+    def __iter__(self) -> Iterator[bytes]:
+        with _map_exceptions():
+            yield from self._stream
+
+    def close(self):
+        if hasattr(self._stream, "close"):
+            self._stream.close()
+
+
+class _HTTP2Transport(httpx.BaseTransport):
+    """DNS 캐시 백엔드를 쓰는 httpcore 연결 풀 위의 httpx 전송 (HTTP/2 + HTTP/1.1, 프록시 미사용)"""
+    def __init__(self, dns_cache: DNSCache, limits: httpx.Limits = HTTP2_LIMITS):
+        self._pool = httpcore.ConnectionPool(
+            ssl_context=httpx.create_ssl_context(),
+            max_connections=limits.max_connections,
+            max_keepalive_connections=limits.max_keepalive_connections,
+            keepalive_expiry=limits.keepalive_expiry,
+            http1=True,
+            http2=True,
+            network_backend=_DNSCachingBackend(dns_cache),
+        )
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        core_request = httpcore.Request(
+            method=request.method,
+            url=httpcore.URL(scheme=request.url.raw_scheme, host=request.url.raw_host,
+                             port=request.url.port, target=request.url.raw_path),
+            headers=request.headers.raw,
+            content=request.stream,
+            extensions=request.extensions,
+        )
+        with _map_exceptions():
+            response = self._pool.handle_request(core_request)
+        return httpx.Response(status_code=response.status, headers=response.headers,
+                              stream=_ResponseStream(response.stream), extensions=response.extensions)
+
+    def close(self):
+        self._pool.close()
+
+
+def _uses_env_proxy(host: str) -> bool:
+    """환경 변수 프록시(HTTPS_PROXY/ALL_PROXY, NO_PROXY 제외)가 host에 적용되는지"""
+    proxies = urllib.request.getproxies()
+    return bool(proxies.get("https") or proxies.get("all")) and not urllib.request.proxy_bypass(host)
+
+
+def create_http2_client(dns_cache: DNSCache, hosts: Iterable[str]) -> httpx.Client:
+    """
+    HTTP/2 다중화(ALPN으로 협상, 미지원 서버는 HTTP/1.1 keep-alive) + DNS 캐시를 적용한 공유 클라이언트.
+    스레드 간 공유 가능하며, 같은 호스트로의 동시 요청은 하나의 연결에서 스트림으로 처리됩니다.
+    DNS 캐시 전송은 hosts에만 마운트하며, 환경 변수 프록시가 적용되는 호스트와 리다이렉트로 넘어간
+    다른 호스트는 httpx 기본 전송(HTTP/2, 프록시·trust_env 처리 포함)을 사용합니다.
+    """
+    transport = _HTTP2Transport(dns_cache)
+    mounts = {f"all://{host}": transport for host in hosts if not _uses_env_proxy(host)}
+    return httpx.Client(http2=True, limits=HTTP2_LIMITS, mounts=mounts,
+                        timeout=REQUEST_TIMEOUT, follow_redirects=True)
@@ -2,12 +2,20 @@ import logging
 import os
 import json
 import time
+import argparse
 from datetime import datetime
+from typing import Optional
 from naver_crawler import NaverNewsCrawler
 from google_crawler import GoogleNewsCrawler
 from google_en_crawler import GoogleEnNewsCrawler
 from sot_guardian import SOTGuardian
 from total_war_scraper import TotalWarScraper
+from profiler import PipelineProfiler
+from checkpoint import RunCheckpoint, DEFAULT_MANIFEST_PATH
+from html_cache import HtmlCache, DEFAULT_CACHE_DIR, DEFAULT_MAX_CACHE_BYTES
+from sot_index import SOTIndex
+from network_guard import NetworkGuard
+from translation_queue import TranslationHandoff
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
@@ -17,11 +25,16 @@ logger = logging.getLogger(__name__)
 MAX_PIPELINE_RETRIES = 3
 PIPELINE_RETRY_DELAY = 30  # 초
 
+QUERY_KO = "인공지능 에이전트"
+QUERY_EN = "AI Agents OR Agentic AI"  # 글로벌 수집을 위한 영문 확장 쿼리
+SOT_PATH = "database/news/news_sot.jsonl"
 
-def main():
-    query_ko = "인공지능 에이전트"
-    query_en = "AI Agents OR Agentic AI"  # 글로벌 수집을 위한 영문 확장 쿼리
-    sot_path = "database/news/news_sot.jsonl"
+
+def main(profile_dir: Optional[str] = None, resume: bool = False, export_parquet: bool = False, http2: bool = False,
+         html_cache_dir: Optional[str] = DEFAULT_CACHE_DIR, html_cache_max_bytes: int = DEFAULT_MAX_CACHE_BYTES):
+    query_ko = QUERY_KO
+    query_en = QUERY_EN
+    sot_path = SOT_PATH
     archive_dir = "database/news/archive"
 
     # SOT 디렉토리 자동 생성
@@ -34,6 +47,23 @@ def main():
     # 공유 TotalWarScraper 인스턴스 (브라우저 재사용으로 성능 최적화)
     total_war = TotalWarScraper()
 
+    # 옵트인 프로파일러 (profile_dir 미지정 시 no-op)
+    profiler = PipelineProfiler(profile_dir)
+    profiler.start()
+
+    # 실행 단위 체크포인트 (resume=True면 직전 미완료 실행을 이어서 진행)
+    # 파이프라인 재시도 시에도 동일 체크포인트를 공유하여 완료된 소스/기사는 다시 수행하지 않음
+    checkpoint = RunCheckpoint(DEFAULT_MANIFEST_PATH, resume=resume)
+
+    # 수집한 원본 HTML 캐시 (추출 로직 변경 시 reextract.py로 재수집 없이 재추출, html_cache_dir=None이면 미사용)
+    html_cache = HtmlCache(html_cache_dir, html_cache_max_bytes) if html_cache_dir else None
+    # 전문 색인: 미색인 SOT 분량을 따라잡은 뒤 저장되는 기사를 즉시 색인
+    index = SOTIndex().attach(SOTGuardian(sot_path))
+    # 공유 네트워크 가드 (http2=True면 고빈도 호스트에 HTTP/2 다중화 + DNS 캐시)
+    net_guard = NetworkGuard(http2=http2)
+    crawler_args = dict(sot_path=sot_path, total_war=total_war, checkpoint=checkpoint, html_cache=html_cache,
+                        net_guard=net_guard)
+
     try:
         for pipeline_attempt in range(1, MAX_PIPELINE_RETRIES + 1):
             if pipeline_attempt > 1:
@@ -43,23 +73,32 @@ def main():
             try:
                 # [WF1] 국내 뉴스 수집 단계
                 logger.info("🟢 [PHASE 1] 국내 환경스캐닝(WF1) 시작")
-                naver = NaverNewsCrawler(sot_path=sot_path, total_war=total_war)
-                naver.run(query_ko)
-                google_kr = GoogleNewsCrawler(sot_path=sot_path, total_war=total_war)
-                google_kr.run(query_ko)
+                suffix = f"_retry{pipeline_attempt}" if pipeline_attempt > 1 else ""
+                with profiler.phase(f"wf1_naver{suffix}"):
+                    naver = NaverNewsCrawler(**crawler_args)
+                    naver.run(query_ko)
+                with profiler.phase(f"wf1_google{suffix}"):
+                    google_kr = GoogleNewsCrawler(**crawler_args)
+                    google_kr.run(query_ko)
                 logger.info("✅ PHASE 1 완료.")
 
                 # [WF2] 글로벌 뉴스 수집 단계
                 logger.info("🔵 [PHASE 2] 글로벌 환경스캐닝(WF2) 시작")
-                google_en = GoogleEnNewsCrawler(sot_path=sot_path, total_war=total_war)
-                en_articles = google_en.run(query_en)
+                with profiler.phase(f"wf2_google_en{suffix}"):
+                    google_en = GoogleEnNewsCrawler(**crawler_args)
+                    en_articles = google_en.run(query_en)
 
                 if en_articles:
                     logger.info(f"📍 {len(en_articles)}개의 영문 기사가 확보되었습니다. 울트라 지능의 현지화 작업을 대기합니다.")
                     for art in en_articles:
                         print(f"TRANSLATION_REQUIRED: {art['url']}|{art['title']}")
+                    # 번역기 입력 크기 단위 배치 파일 (기사 ID + SOT 오프셋/길이)
+                    handoff_path = TranslationHandoff(sot_path, index).write(en_articles)
+                    if handoff_path:
+                        print(f"TRANSLATION_HANDOFF: {handoff_path}")
 
                 logger.info("✅ PHASE 2 원천 데이터 확보 완료.")
+                checkpoint.finish()
                 break  # 성공 시 반복 종료
 
             except Exception as e:
@@ -67,12 +106,42 @@ def main():
                 if pipeline_attempt >= MAX_PIPELINE_RETRIES:
                     logger.error(f"❌ [PIPELINE] 최대 재시도 도달. 수집된 데이터로 진행합니다.")
 
+        # SOT 증분을 Parquet 분석 데이터셋에 반영 (pyarrow는 이 단계에서만 로드)
+        if export_parquet:
+            from sot_parquet import SOTParquetExporter
+            SOTParquetExporter(sot_path).export()
+
         # [PHASE 3] 통합 보고서 산출은 모든 SOT 적재가 끝난 후 에이전트에 의해 수동/자동 호출됩니다.
         logger.info("🏁 모든 워크플로우 임무를 완료했습니다. 통합 보고서 생성을 준비하십시오.")
     finally:
         # 브라우저 인스턴스 명시적 종료 (리소스 누수 방지)
         total_war.close()
+        if html_cache is not None:
+            html_cache.close()
+        index.close()
+        net_guard.close()
+        profiler.stop()
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="통합 환경스캐닝 파이프라인")
+    parser.add_argument(
+        "--profile", nargs="?", const=os.path.join("profiles", datetime.now().strftime("%Y%m%d_%H%M%S")),
+        default=None, metavar="DIR",
+        help="단계별 cProfile/tracemalloc 결과를 DIR에 저장 (기본: profiles/<실행시각>)",
+    )
+    parser.add_argument("--resume", action="store_true",
+                        help=f"중단된 직전 실행을 체크포인트({DEFAULT_MANIFEST_PATH})에서 이어서 진행")
+    parser.add_argument("--export-parquet", action="store_true",
+                        help="수집 후 SOT 증분을 Parquet 데이터셋(database/news/parquet)에 반영")
+    parser.add_argument("--http2", action="store_true",
+                        help="Google News/Naver 고빈도 호스트 요청에 httpx HTTP/2 다중화 + DNS 캐시 사용")
+    parser.add_argument("--html-cache-dir", default=DEFAULT_CACHE_DIR, metavar="DIR",
+                        help="원본 HTML 캐시 디렉터리 (reextract.py 재추출용)")
+    parser.add_argument("--html-cache-max-bytes", type=int, default=DEFAULT_MAX_CACHE_BYTES, metavar="N",
+                        help="원본 HTML 캐시 총량 상한 (압축 후 바이트, 기본 1GiB)")
+    parser.add_argument("--no-html-cache", action="store_true", help="원본 HTML 캐시를 사용하지 않음")
+    args = parser.parse_args()
+    main(profile_dir=args.profile, resume=args.resume, export_parquet=args.export_parquet, http2=args.http2,
+         html_cache_dir=None if args.no_html_cache else args.html_cache_dir,
+         html_cache_max_bytes=args.html_cache_max_bytes)
@@ -1,39 +1,30 @@
-import os
-import json
-import time
-import requests
 import logging
-from datetime import datetime, timedelta
-from bs4 import BeautifulSoup
+from datetime import date
 from typing import List, Dict, Optional
-from sot_guardian import SOTGuardian
-from network_guard import NetworkGuard
-from total_war_scraper import TotalWarScraper
+from crawler_base import CrawlerBase
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
 logger = logging.getLogger(__name__)
 
-# 실패 기사 최대 재시도 라운드 수
-MAX_RETRY_ROUNDS = 3
 
+class NaverNewsCrawler(CrawlerBase):
+    """네이버 뉴스 어댑터: 검색 결과 페이지 순회 + 기사 본문 셀렉터 파싱"""
+    SOURCE = "naver"
+    WF_ID = "wf1"
+    LANG = "ko"
+    LOG_NAME = "Naver"
+    # 파싱 자체가 실패했을 때만 Total War 가동 (200자 기준은 parse_article에서 판정)
+    MIN_CONTENT_LENGTH = 0
 
-class NaverNewsCrawler:
-    def __init__(self, sot_path: str = "database/news/news_sot.jsonl", total_war: TotalWarScraper = None):
-        self.guardian = SOTGuardian(sot_path)
-        self.net_guard = NetworkGuard()
-        self.total_war = total_war or TotalWarScraper()
-        self.session = requests.Session()
-
-    def _get_headers(self) -> Dict:
-        return self.net_guard.get_rotated_headers()
-
-    def search_news(self, query: str) -> List[str]:
+    def search_news(self, query: str, day: Optional[date] = None) -> List[str]:
+        # 기간 지정: pd=1(최근 1일) 또는 pd=3&ds=&de=(특정 일자)
+        period = f"pd=3&ds={day:%Y.%m.%d}&de={day:%Y.%m.%d}" if day else "pd=1"
         urls = []
         page = 0
         consecutive_empty = 0
         while page < 10:  # 최대 100개 기사 (일간 스캔에 충분)
             start = page * 10 + 1
-            search_url = f"https://search.naver.com/search.naver?where=news&query={query}&pd=1&start={start}"
+            search_url = f"https://search.naver.com/search.naver?where=news&query={query}&{period}&start={start}"
 
             # 7대 원칙 적용된 요청
             response = self.net_guard.robust_request(search_url, self._get_headers())
@@ -41,6 +32,7 @@ class NaverNewsCrawler:
 
             try:
                 # 5. 파싱 오류 검사
+                from bs4 import BeautifulSoup
                 soup = BeautifulSoup(response.text, 'lxml')
                 links = soup.select("a")
                 found_new = False
@@ -65,76 +57,20 @@ class NaverNewsCrawler:
 
         return list(set(urls))
 
-    def crawl_article(self, url: str) -> Optional[Dict]:
-        # P1: URL 기반 조기 중복 검사 — 네트워크 요청 전에 차단
-        if self.guardian.is_url_known(url):
-            logger.info(f"[SOT Guardian] URL already in SOT, skipping: {url}")
-            return None
-
-        # 1-4단계 및 6단계 원칙 적용
-        response = self.net_guard.robust_request(url, self._get_headers())
-
-        article_data = None
-        if response:
-            try:
-                soup = BeautifulSoup(response.text, 'lxml')
-                title_elem = soup.select_one("#title_area span, .media_end_head_headline")
-                title = title_elem.get_text(strip=True) if title_elem else ""
-
-                date_elem = soup.select_one(".media_end_head_info_datestamp_time, .t11")
-                date_str = date_elem.get_text(strip=True) if date_elem else ""
-
-                content_elem = soup.select_one("#dic_area, #newsct_article")
-                if content_elem:
-                    for unwanted in content_elem.select(".article_footer, .img_desc, script, style"): unwanted.decompose()
-                    content = content_elem.get_text(strip=True)
-                    if len(content) > 200:
-                        article_data = {"title": title, "date": date_str, "content": content}
-            except: pass
-
-        # [절대 기준] 수집 실패 시 Total War 가동
-        if not article_data:
-            tw_result = self.total_war.scrape_with_all_means(url)
-            if tw_result:
-                article_data = {
-                    "title": tw_result['title'],
-                    "date": datetime.now().strftime("%Y-%m-%d"),  # 일자 누락 시 오늘 날짜
-                    "content": tw_result['content']
-                }
-
-        if article_data:
-            article = {**article_data, "url": url, "source": "naver", "wf_id": "wf1", "lang": "ko"}
-            if self.guardian.save_article(article):
-                return article
-
-        logger.error(f"❌ [MISSION FAIL] Naver 수집 실패 (재시도 대상): {url}")
+    @classmethod
+    def parse_article(cls, html: str, url: str) -> Optional[Dict]:
+        from bs4 import BeautifulSoup
+        soup = BeautifulSoup(html, 'lxml')
+        title_elem = soup.select_one("#title_area span, .media_end_head_headline")
+        title = title_elem.get_text(strip=True) if title_elem else ""
+
+        date_elem = soup.select_one(".media_end_head_info_datestamp_time, .t11")
+        date_str = date_elem.get_text(strip=True) if date_elem else ""
+
+        content_elem = soup.select_one("#dic_area, #newsct_article")
+        if content_elem:
+            for unwanted in content_elem.select(".article_footer, .img_desc, script, style"): unwanted.decompose()
+            content = content_elem.get_text(strip=True)
+            if len(content) > 200:
+                return {"title": title, "date": date_str, "content": content}
         return None
-
-    def run(self, query: str):
-        urls = self.search_news(query)
-        logger.info(f"[Naver] 발견된 기사 URL: {len(urls)}개")
-
-        # 1차 수집
-        failed_urls = []
-        for url in urls:
-            result = self.crawl_article(url)
-            if result is None and not self.guardian.is_url_known(url):
-                failed_urls.append(url)
-
-        # 실패 기사 재시도 (최대 MAX_RETRY_ROUNDS 라운드)
-        for round_num in range(1, MAX_RETRY_ROUNDS + 1):
-            if not failed_urls:
-                break
-            logger.warning(f"🔄 [Naver] 재시도 라운드 {round_num}/{MAX_RETRY_ROUNDS}: {len(failed_urls)}개 실패 기사")
-            time.sleep(5 * round_num)  # 라운드마다 대기 시간 증가
-            still_failed = []
-            for url in failed_urls:
-                result = self.crawl_article(url)
-                if result is None and not self.guardian.is_url_known(url):
-                    still_failed.append(url)
-            failed_urls = still_failed
-
-        if failed_urls:
-            logger.error(f"⚠️ [Naver] 최종 미수집 기사: {len(failed_urls)}개")
-        else:
-            logger.info(f"✅ [Naver] 모든 기사 수집 완료")
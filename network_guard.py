@@ -1,10 +1,16 @@
+import re
 import time
+import codecs
 import random
-import requests
 import logging
+import threading
 import urllib.parse
 from datetime import datetime
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple, Union, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import httpx
+    import requests
 
 logger = logging.getLogger(__name__)
 
@@ -20,16 +26,111 @@ _UA_POOL: List[str] = [
 ]
 
 
+# 스트리밍 수집 시 본문 최대 바이트 수 (초과분은 읽지 않음)
+DEFAULT_MAX_BODY_BYTES = 2 * 1024 * 1024
+_STREAM_CHUNK_SIZE = 64 * 1024
+
+# 본문 추출 대상으로 허용하는 Content-Type (헤더가 없으면 HTML로 간주)
+_HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml", "text/xml", "application/xml",
+                       "application/rss+xml", "application/atom+xml", "text/plain")
+
+# 선언된 charset이 없을 때 앞부분에서만 찾는 <meta charset> / http-equiv 선언
+_META_CHARSET_RE = re.compile(rb'<meta[^>]+charset=["\']?\s*([A-Za-z0-9_:.\-]+)', re.IGNORECASE)
+_META_SNIFF_BYTES = 4096
+
+# HTTP/2 모드에서 공유 연결(다중화) + DNS 캐시를 적용할 고빈도 호스트
+DEFAULT_HTTP2_HOSTS = frozenset({"news.google.com", "search.naver.com", "n.news.naver.com"})
+# DNS 캐시 유지 시간 (초). getaddrinfo는 레코드 TTL을 알려주지 않으므로 고정값 사용
+DEFAULT_DNS_TTL = 300.0
+
+# 한국어 사이트가 흔히 선언하는 euc-kr은 상위 집합인 cp949로 디코딩 (확장 한글 깨짐 방지)
+_CHARSET_ALIASES = {"euc-kr": "cp949", "euc_kr": "cp949", "ks_c_5601-1987": "cp949", "x-windows-949": "cp949"}
+
+
+def _normalize_charset(name: Optional[str]) -> Optional[str]:
+    if not name:
+        return None
+    name = name.strip().strip('"\'').lower()
+    name = _CHARSET_ALIASES.get(name, name)
+    try:
+        return codecs.lookup(name).name
+    except LookupError:
+        return None
+
+
+def decode_html(body: bytes, content_type: str = "") -> Tuple[str, str]:
+    """
+    선언된 charset(Content-Type) → BOM → <meta> 선언 → UTF-8 순으로 디코딩 방식을 결정.
+    전체 본문을 대상으로 한 charset 추측(chardet 계열)은 수행하지 않습니다.
+    """
+    encoding = None
+    match = re.search(r'charset=([^;\s]+)', content_type or "", re.IGNORECASE)
+    if match:
+        encoding = _normalize_charset(match.group(1))
+    if not encoding:
+        for bom, bom_encoding in ((codecs.BOM_UTF8, "utf-8-sig"), (codecs.BOM_UTF16_LE, "utf-16"), (codecs.BOM_UTF16_BE, "utf-16")):
+            if body.startswith(bom):
+                encoding = bom_encoding
+                break
+    if not encoding:
+        meta = _META_CHARSET_RE.search(body[:_META_SNIFF_BYTES])
+        if meta:
+            encoding = _normalize_charset(meta.group(1).decode('ascii', errors='ignore'))
+    encoding = encoding or "utf-8"
+    return body.decode(encoding, errors='replace'), encoding
+
+
 class NetworkGuard:
     """
     7대 원칙(URL 유효성, 네트워크, 인증, 응답코드, 파싱, 속도제한, 로깅)을
     수행하며 최적의 요청 전략을 결정하는 지능형 가드.
     차단 감지 시 User-Agent 로테이션으로 실시간 우회.
+    http2=True면 http2_hosts 요청을 httpx 공유 클라이언트(HTTP/2 다중화 + DNS 캐시)로 보내고,
+    그 외 호스트는 기존 requests 경로를 그대로 사용합니다.
     """
-    def __init__(self):
+    def __init__(self, http2: bool = False, http2_hosts=DEFAULT_HTTP2_HOSTS, dns_ttl: float = DEFAULT_DNS_TTL):
         self.max_retries = 5
         self.base_delay = 2.0
+        self.max_body_bytes = DEFAULT_MAX_BODY_BYTES
         self._ua_index = random.randint(0, len(_UA_POOL) - 1)
+        self.http2 = http2
+        self.http2_hosts = frozenset(http2_hosts)
+        self.dns_ttl = dns_ttl
+        # httpx 클라이언트는 첫 대상 요청 시 생성 (크롤러 스레드 간 공유)
+        self._client = None
+        self._dns_cache = None
+        self._client_lock = threading.Lock()
+
+    def close(self):
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    def _use_http2(self, url: str) -> bool:
+        return self.http2 and urllib.parse.urlparse(url).hostname in self.http2_hosts
+
+    def _get_client(self):
+        with self._client_lock:
+            if self._client is None:
+                from http_transport import DNSCache, create_http2_client
+                self._dns_cache = DNSCache(self.dns_ttl)
+                self._client = create_http2_client(self._dns_cache, self.http2_hosts)
+            return self._client
+
+    def _send(self, url: str, headers: Dict, stream: bool):
+        """전송 경로 선택. 반환 응답은 status_code/headers/text/close와 iter_content 또는 iter_bytes를 제공"""
+        if self._use_http2(url):
+            client = self._get_client()
+            return client.send(client.build_request("GET", url, headers=headers), stream=stream)
+        import requests
+        return requests.get(url, headers=headers, timeout=15, allow_redirects=True, stream=stream)
+
+    def _connection_errors(self, url: str) -> tuple:
+        if self._use_http2(url):
+            import httpx
+            return (httpx.ConnectError, httpx.ConnectTimeout)
+        import requests
+        return (requests.exceptions.ConnectionError,)
 
     def get_rotated_headers(self, extra_headers: Dict = None) -> Dict:
         """매 요청마다 User-Agent를 순환하여 차단 우회"""
@@ -44,11 +145,13 @@ class NetworkGuard:
         parsed = urllib.parse.urlparse(url)
         return all([parsed.scheme, parsed.netloc])
 
-    def robust_request(self, url: str, headers: Dict = None) -> Optional[requests.Response]:
+    def robust_request(self, url: str, headers: Dict = None, stream: bool = False) -> Optional[Union["requests.Response", "httpx.Response"]]:
+        """stream=True면 본문을 읽지 않은 응답을 반환 (호출자가 소비 후 close)"""
         if not self.validate_url(url):
             logger.error(f"[NetworkGuard] 1. 유효하지 않은 URL: {url}")
             return None
 
+        connection_errors = self._connection_errors(url)
         for attempt in range(self.max_retries):
             try:
                 # 재시도 시 UA 로테이션 적용 (차단 우회)
@@ -60,12 +163,13 @@ class NetworkGuard:
                     logger.info(f"[NetworkGuard] 6. 재시도 {attempt}회차 지연: {delay:.1f}s (UA 로테이션 적용)")
                     time.sleep(delay)
 
-                response = requests.get(url, headers=req_headers, timeout=15, allow_redirects=True)
+                response = self._send(url, req_headers, stream)
 
                 # 4. 응답 코드 분석
                 status = response.status_code
                 if status == 200:
                     return response
+                response.close()
 
                 # 3. 인증/권한 차단 감지 → UA 로테이션으로 우회
                 if status in [401, 403, 407]:
@@ -77,10 +181,54 @@ class NetworkGuard:
                 else:
                     logger.error(f"[NetworkGuard] 4. 비정상 응답({status}): {url}")
 
-            except requests.exceptions.ConnectionError:
+            except connection_errors:
                 logger.error(f"[NetworkGuard] 2. 서버 연결 실패: {url}")
             except Exception as e:
                 # 7. 상세 에러 로깅
                 logger.error(f"[NetworkGuard] 7. 예외 발생: {str(e)} | URL: {url}")
 
         return None
+
+    def fetch_html(self, url: str, headers: Dict = None, max_bytes: Optional[int] = None) -> Optional[Dict]:
+        """
+        스트리밍 수집: Content-Type을 본문 수신 전에 검사하고, max_bytes까지만 읽은 뒤
+        선언된(또는 <meta>) charset으로 디코딩합니다.
+        반환값: None(요청 실패) 또는 {"html", "content_type", "encoding", "truncated"}.
+        HTML이 아닌 문서(PDF, 동영상 등)는 본문을 받지 않고 html=None으로 반환합니다.
+        """
+        max_bytes = max_bytes or self.max_body_bytes
+        response = self.robust_request(url, headers, stream=True)
+        if response is None:
+            return None
+
+        try:
+            content_type = response.headers.get("Content-Type", "")
+            mime = content_type.split(";")[0].strip().lower()
+            if mime and mime not in _HTML_CONTENT_TYPES:
+                logger.warning(f"[NetworkGuard] 5. HTML이 아닌 문서({mime}) 본문 수신 생략: {url}")
+                return {"html": None, "content_type": mime, "encoding": None, "truncated": False}
+
+            chunks = []
+            received = 0
+            truncated = False
+            if hasattr(response, "iter_bytes"):
+                body_chunks = response.iter_bytes(_STREAM_CHUNK_SIZE)  # httpx
+            else:
+                body_chunks = response.iter_content(chunk_size=_STREAM_CHUNK_SIZE)  # requests
+            for chunk in body_chunks:
+                chunks.append(chunk)
+                received += len(chunk)
+                if received >= max_bytes:
+                    truncated = True
+                    break
+            body = b"".join(chunks)[:max_bytes]
+            if truncated:
+                logger.info(f"[NetworkGuard] 본문 {max_bytes // 1024}KiB 상한 도달, 이후 수신 중단: {url}")
+
+            html, encoding = decode_html(body, content_type)
+            return {"html": html, "content_type": mime, "encoding": encoding, "truncated": truncated}
+        except Exception as e:
+            logger.error(f"[NetworkGuard] 7. 스트리밍 수신 예외: {str(e)} | URL: {url}")
+            return None
+        finally:
+            response.close()
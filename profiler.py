@@ -0,0 +1,150 @@
+import os
+import time
+import cProfile
+import pstats
+import logging
+import functools
+import importlib
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 프로파일링 대상 핫 함수: (모듈, 클래스, 메서드)
+HOT_FUNCTIONS: List[Tuple[str, str, str]] = [
+    ("network_guard", "NetworkGuard", "robust_request"),
+    ("google_crawler", "GoogleNewsCrawler", "decode_url"),
+    ("crawler_base", "CrawlerBase", "crawl_article"),
+    ("total_war_scraper", "TotalWarScraper", "scrape_with_all_means"),
+    ("sot_guardian", "SOTGuardian", "save_article"),
+]
+
+# tracemalloc 스냅샷 프레임 깊이 / 요약 상위 N개
+TRACEMALLOC_FRAMES = 10
+DEFAULT_TOP_N = 20
+
+
+class PipelineProfiler:
+    """
+    파이프라인 단계별 cProfile + tracemalloc 계측기.
+    output_dir이 None이면 모든 훅이 no-op으로 동작하여 평상시 실행에 비용을 주지 않습니다.
+    단계마다 <순번>_<단계명>.prof 파일을, 종료 시 summary.txt(할당 상위 N + 핫 함수 통계)를 남깁니다.
+    """
+    def __init__(self, output_dir: Optional[str] = None, top_n: int = DEFAULT_TOP_N):
+        self.enabled = output_dir is not None
+        self.output_dir = output_dir
+        self.top_n = top_n
+        self._phase_index = 0
+        self._patched: List[Tuple[type, str, object]] = []
+        self._hot_stats: Dict[str, Dict] = {}
+        self._reports: List[str] = []
+
+    def start(self):
+        """tracemalloc 가동 및 핫 함수 계측 래퍼 설치"""
+        if not self.enabled:
+            return
+        os.makedirs(self.output_dir, exist_ok=True)
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+        self._install_hot_wrappers()
+        logger.info(f"[PROFILER] 프로파일링 모드 가동: {self.output_dir}")
+
+    def _install_hot_wrappers(self):
+        seen = set()
+        for module_name, class_name, method_name in HOT_FUNCTIONS:
+            cls = getattr(importlib.import_module(module_name), class_name)
+            # 상속으로 동일 함수가 여러 클래스에 노출될 수 있으므로 실제 정의 위치 기준으로 한 번만 감쌈
+            owner = next(c for c in cls.__mro__ if method_name in c.__dict__)
+            if (owner, method_name) in seen:
+                continue
+            seen.add((owner, method_name))
+            original = owner.__dict__[method_name]
+            label = f"{owner.__name__}.{method_name}"
+            setattr(owner, method_name, self._wrap(label, original))
+            self._patched.append((owner, method_name, original))
+
+    def _wrap(self, label: str, func):
+        profiler = self
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            mem_before = tracemalloc.get_traced_memory()[0]
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                stat = profiler._hot_stats.setdefault(label, {"calls": 0, "seconds": 0.0, "net_bytes": 0})
+                stat["calls"] += 1
+                stat["seconds"] += time.perf_counter() - started
+                stat["net_bytes"] += tracemalloc.get_traced_memory()[0] - mem_before
+        return wrapper
+
+    @contextmanager
+    def phase(self, name: str):
+        """단계 하나를 cProfile로 감싸고 시작/종료 시점 tracemalloc 스냅샷을 비교"""
+        if not self.enabled:
+            yield
+            return
+
+        self._phase_index += 1
+        self._hot_stats = {}
+        tracemalloc.reset_peak()
+        snapshot_before = tracemalloc.take_snapshot()
+        profile = cProfile.Profile()
+        started = time.perf_counter()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            elapsed = time.perf_counter() - started
+            snapshot_after = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+
+            prof_path = os.path.join(self.output_dir, f"{self._phase_index:02d}_{name}.prof")
+            profile.dump_stats(prof_path)
+            self._reports.append(self._format_phase_report(name, elapsed, peak, profile, snapshot_before, snapshot_after))
+            logger.info(f"[PROFILER] {name} 단계 계측 완료 ({elapsed:.1f}s, peak {peak / 1024 / 1024:.1f}MiB): {prof_path}")
+
+    def _format_phase_report(self, name: str, elapsed: float, peak: int, profile: cProfile.Profile,
+                             snapshot_before, snapshot_after) -> str:
+        lines = [
+            "=" * 70,
+            f"[{self._phase_index:02d}] {name}: wall {elapsed:.2f}s, tracemalloc peak {peak / 1024 / 1024:.2f}MiB",
+            "=" * 70,
+            "",
+            f"-- 핫 함수 (호출수 / 누적 시간 / 순 할당량)",
+        ]
+        for label, stat in sorted(self._hot_stats.items(), key=lambda kv: kv[1]["seconds"], reverse=True):
+            lines.append(f"  {label:<40} {stat['calls']:>6}회 {stat['seconds']:>9.3f}s {stat['net_bytes'] / 1024:>+12.1f}KiB")
+
+        lines += ["", f"-- 할당 증가 상위 {self.top_n} (파일:라인)"]
+        filters = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, "<frozen importlib._bootstrap*>")]
+        diff = snapshot_after.filter_traces(filters).compare_to(snapshot_before.filter_traces(filters), "lineno")
+        for stat in diff[:self.top_n]:
+            lines.append(f"  {stat}")
+
+        lines += ["", f"-- CPU 누적 시간 상위 {self.top_n}"]
+        stats = pstats.Stats(profile)
+        entries = sorted(stats.stats.items(), key=lambda kv: kv[1][3], reverse=True)
+        for (filename, lineno, func_name), (_, ncalls, tottime, cumtime, _) in entries[:self.top_n]:
+            lines.append(f"  {cumtime:>9.3f}s cum {tottime:>9.3f}s tot {ncalls:>7} {os.path.basename(filename)}:{lineno}({func_name})")
+        lines.append("")
+        return "\n".join(lines)
+
+    def stop(self):
+        """계측 래퍼 제거 및 요약 파일 저장"""
+        if not self.enabled:
+            return
+        for owner, method_name, original in reversed(self._patched):
+            setattr(owner, method_name, original)
+        self._patched = []
+
+        summary_path = os.path.join(self.output_dir, "summary.txt")
+        with open(summary_path, "w", encoding="utf-8") as f:
+            f.write(f"# Pipeline profile — {datetime.now().isoformat()}\n\n")
+            f.write("\n".join(self._reports))
+        tracemalloc.stop()
+        logger.info(f"[PROFILER] 요약 저장 완료: {summary_path}")
@@ -0,0 +1,141 @@
+import os
+import json
+import logging
+import argparse
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+from distributed import SOURCE_ADAPTERS
+from html_cache import HtmlCache, DEFAULT_CACHE_DIR
+from sot_guardian import SOTGuardian
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
+logger = logging.getLogger(__name__)
+
+DEFAULT_OUTPUT_PATH = "database/news/news_sot.reextracted.jsonl"
+
+# 한 번에 프로세스 풀로 보내는 레코드 수 (메모리 상한)
+BATCH_SIZE = 256
+
+_REQUIRED_KEYS = ("title", "date", "content", "url")
+
+
+def _extract(job: Tuple[str, str, str, object]) -> Optional[Dict]:
+    """워커 프로세스: 캐시 blob을 읽어 소스 어댑터의 parse_article로 재추출 (네트워크 없음)"""
+    cache_root, digest, source, item = job
+    html = HtmlCache.read_blob(cache_root, digest)
+    if html is None:
+        return None
+    adapter = SOURCE_ADAPTERS[source]
+    try:
+        parsed = adapter.parse_article(html, item)
+    except Exception:
+        return None
+    # 실시간 수집에서 표준 경로로 채택될 길이에 못 미치면 기존 레코드 유지
+    if not parsed or len(parsed["content"]) < adapter.MIN_CONTENT_LENGTH:
+        return None
+    return parsed
+
+
+def _read_sot(sot_path: str) -> Iterator[Dict]:
+    with open(sot_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+def _batched(iterable, size: int) -> Iterator[List]:
+    batch = []
+    for entry in iterable:
+        batch.append(entry)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class ReExtractor:
+    """
+    HtmlCache의 원본 HTML로 SOT를 재구성합니다.
+    1) 기존 SOT를 순서대로 읽으며 캐시가 있는 레코드는 현재 추출 로직으로 title/date/content를 갱신
+    2) SOT에 없던 캐시 페이지(당시 임계값 미달 등)도 현재 로직으로 추출되면 신규 레코드로 추가
+    추출은 CPU 코어 수만큼의 프로세스에서 병렬 수행되고, 결과는 SOT 규칙(필수 항목, 내용 지문 중복 제거)으로 기록됩니다.
+    """
+    def __init__(self, cache: HtmlCache, workers: Optional[int] = None):
+        self.cache = cache
+        self.workers = workers or os.cpu_count() or 1
+        self.stats = Counter()
+        self._fingerprints = set()
+
+    def _write(self, f, record: Dict) -> bool:
+        if any(not record.get(k) for k in _REQUIRED_KEYS):
+            self.stats["rejected"] += 1
+            return False
+        fingerprint = SOTGuardian._generate_fingerprint(record["title"], record["content"])
+        if fingerprint in self._fingerprints:
+            self.stats["duplicate"] += 1
+            return False
+        self._fingerprints.add(fingerprint)
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        return True
+
+    def run(self, sot_path: str, out_path: str) -> Dict:
+        seen_urls = set()
+        tmp_path = f"{out_path}.tmp"
+        os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+        with ProcessPoolExecutor(max_workers=self.workers) as pool, open(tmp_path, 'w', encoding='utf-8') as f:
+            # 1) 기존 SOT 레코드 갱신 (SOT 순서 유지)
+            if os.path.exists(sot_path):
+                for batch in _batched(_read_sot(sot_path), BATCH_SIZE):
+                    entries = [self.cache.lookup(r.get("url", "")) for r in batch]
+                    jobs = [(self.cache.root, e["digest"], e["source"], e["item"]) for e in entries if e]
+                    extracted = iter(pool.map(_extract, jobs, chunksize=16))
+                    for record, entry in zip(batch, entries):
+                        seen_urls.add(record.get("url"))
+                        parsed = next(extracted) if entry else None
+                        updated = {**record, **parsed} if parsed else None
+                        # 재추출 결과가 필수 항목을 잃으면 기존 레코드 유지
+                        if updated and all(updated.get(k) for k in _REQUIRED_KEYS):
+                            record = updated
+                            self.stats["updated"] += 1
+                        else:
+                            self.stats["kept"] += 1
+                        self._write(f, record)
+
+            # 2) SOT에 없던 캐시 페이지
+            new_entries = (e for e in self.cache.entries() if e["url"] not in seen_urls and e["source"] in SOURCE_ADAPTERS)
+            for batch in _batched(new_entries, BATCH_SIZE):
+                jobs = [(self.cache.root, e["digest"], e["source"], e["item"]) for e in batch]
+                for entry, parsed in zip(batch, pool.map(_extract, jobs, chunksize=16)):
+                    if not parsed:
+                        continue
+                    adapter = SOURCE_ADAPTERS[entry["source"]]
+                    record = {**parsed, "url": entry["url"], "source": adapter.SOURCE, "wf_id": adapter.WF_ID,
+                              "lang": adapter.LANG, "collected_at": datetime.now().isoformat()}
+                    if self._write(f, record):
+                        self.stats["added"] += 1
+        os.replace(tmp_path, out_path)
+        logger.info(f"[ReExtract] 완료 → {out_path}: {dict(self.stats)}")
+        return dict(self.stats)
+
+
+if __name__ == "__main__":
+    from main import SOT_PATH
+
+    parser = argparse.ArgumentParser(description="HTML 캐시 기반 SOT 재추출 (네트워크 요청 없음)")
+    parser.add_argument("--cache", default=DEFAULT_CACHE_DIR, help="HTML 캐시 디렉토리")
+    parser.add_argument("--sot", default=SOT_PATH, help="기준 SOT 경로")
+    parser.add_argument("--out", default=DEFAULT_OUTPUT_PATH, help="재구성된 SOT 출력 경로 (기준 SOT는 변경하지 않음)")
+    parser.add_argument("--workers", type=int, default=None, help="추출 프로세스 수 (기본: CPU 코어 수)")
+    args = parser.parse_args()
+
+    cache = HtmlCache(args.cache)
+    try:
+        logger.info(f"[ReExtract] 캐시 현황: {cache.stats()}")
+        ReExtractor(cache, args.workers).run(args.sot, args.out)
+    finally:
+        cache.close()
@@ -3,7 +3,7 @@ import json
 import hashlib
 import logging
 from filelock import FileLock, Timeout
-from typing import Dict, Set
+from typing import Callable, Dict, Set
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +19,8 @@ class SOTGuardian:
             cls._instance = super(SOTGuardian, cls).__new__(cls)
             cls._instance.sot_path = sot_path
             cls._instance.lock_path = f"{sot_path}.lock"
+            # 저장 직후 (article, SOT 바이트 오프셋, 바이트 길이)로 호출되는 콜백 (색인 등)
+            cls._instance.listeners = []
             # 초기화 시 한 번만 기존 SOT를 스캔하여 메모리에 적재 (속도 최적화)
             cls._instance.seen_content_hashes = cls._instance._load_sot_hashes()
         return cls._instance
@@ -42,11 +44,34 @@ class SOTGuardian:
         logger.info(f"[SOT Guardian] 초기화 완료: {len(hashes)}개 해시 지문, {len(urls)}개 URL 적재")
         return hashes
 
-    def _generate_fingerprint(self, title: str, content: str) -> str:
+    @staticmethod
+    def _generate_fingerprint(title: str, content: str) -> str:
         """제목과 본문 앞 100자를 활용해 내용 기반 고유 지문 생성"""
         safe_content = content[:100] if content else ""
         return hashlib.md5((title + safe_content).encode('utf-8')).hexdigest()
 
+    @staticmethod
+    def article_id(url: str) -> str:
+        """URL 기반 기사 식별자 (색인·번역 큐 등 SOT 외부에서 기사를 가리킬 때 사용)"""
+        return hashlib.sha1(url.encode('utf-8')).hexdigest()[:16]
+
+    @staticmethod
+    def read_record(sot_path: str, offset: int, length: int) -> Dict:
+        """SOT 바이트 오프셋/길이로 레코드 1건을 직접 읽음 (전체 스캔·싱글톤 초기화 없이)"""
+        with open(sot_path, 'rb') as f:
+            f.seek(offset)
+            return json.loads(f.read(length))
+
+    def add_listener(self, callback: Callable[[Dict, int, int], None]):
+        """저장 성공 시마다 callback(article, offset, length) 호출. 콜백 실패는 저장 결과에 영향 없음"""
+        if callback not in self.listeners:
+            self.listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[Dict, int, int], None]):
+        """등록한 콜백 해제 (싱글톤이므로 콜백 소유자가 닫힐 때 반드시 호출)"""
+        if callback in self.listeners:
+            self.listeners.remove(callback)
+
     def is_url_known(self, url: str) -> bool:
         """URL 기반 조기 중복 검사 — 크롤링 시작 전에 호출하여 불필요한 네트워크 요청 차단"""
         return url in self.seen_urls
@@ -88,13 +113,17 @@ class SOTGuardian:
         # 4. Atomic Write (동시성 제어)
         try:
             with FileLock(self.lock_path, timeout=10):
-                # Lock 획득 후 파일에 쓰기
-                with open(self.sot_path, 'a', encoding='utf-8') as f:
-                    f.write(json.dumps(article, ensure_ascii=False) + "\n")
+                # Lock 획득 후 파일에 쓰기 (바이트 단위로 기록하여 레코드 위치 확보)
+                line = (json.dumps(article, ensure_ascii=False) + "\n").encode('utf-8')
+                with open(self.sot_path, 'ab') as f:
+                    offset = f.seek(0, os.SEEK_END)
+                    f.write(line)
                 # 메모리에 지문 및 URL 등록 (동일 인스턴스를 공유하는 다른 에이전트들이 즉시 인지하도록)
                 self.seen_content_hashes.add(fingerprint)
                 if article.get('url'):
                     self.seen_urls.add(article['url'])
+                # Lock 안에서 호출하여 콜백이 SOT 기록 순서대로 실행되도록 함
+                self._notify(article, offset, len(line))
                 return True
         except Timeout:
             logger.error(f"[SOT Guardian] Lock 획득 시간 초과. 저장 실패: {article['title'][:20]}")
@@ -102,3 +131,10 @@ class SOTGuardian:
         except Exception as e:
             logger.error(f"[SOT Guardian] SOT 쓰기 치명적 오류: {e}")
             return False
+
+    def _notify(self, article: Dict, offset: int, length: int):
+        for callback in list(self.listeners):
+            try:
+                callback(article, offset, length)
+            except Exception as e:
+                logger.warning(f"[SOT Guardian] 저장 후속 처리 실패 ({getattr(callback, '__qualname__', callback)}): {e}")
@@ -0,0 +1,257 @@
+import os
+import re
+import json
+import time
+import sqlite3
+import logging
+import argparse
+import operator
+import threading
+from typing import Dict, Iterator, List, Optional
+from sot_guardian import SOTGuardian
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX_PATH = "database/news/index/sot_fts.sqlite"
+
+# (한글 음절 연속 구간, 그 외 문자·숫자 단어)
+_TOKEN_RE = re.compile(r"([가-힣]+)|([^\W_가-힣]+)")
+
+# title 가중치가 content보다 높도록 bm25 열 가중치 지정
+_BM25_WEIGHTS = (3.0, 1.0)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    rowid      INTEGER PRIMARY KEY,
+    id         TEXT NOT NULL UNIQUE,
+    url        TEXT NOT NULL,
+    title      TEXT,
+    source     TEXT,
+    lang       TEXT,
+    date       TEXT,
+    sot_offset INTEGER NOT NULL,
+    sot_length INTEGER NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS docs_fts USING fts5(title, content, tokenize = 'porter unicode61');
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    색인/검색 공용 토크나이저.
+    한글은 띄어쓰기·조사 변화에 무관하게 부분 일치하도록 음절 bigram으로, 그 외(영문·숫자)는 소문자 단어로 분할
+    """
+    tokens = []
+    for hangul, word in _TOKEN_RE.findall(text.lower()):
+        if len(hangul) > 1:
+            tokens.extend(map(operator.add, hangul[:-1], hangul[1:]))
+        else:
+            tokens.append(hangul or word)
+    return tokens
+
+
+def _to_match_query(query: str) -> Optional[str]:
+    """
+    검색어 → FTS5 MATCH 식. 단어는 모두 포함(AND)해야 하며,
+    여러 음절의 한글 단어는 bigram 구(phrase)로, 한 음절 한글은 접두 검색으로 변환
+    """
+    terms = []
+    for hangul, word in _TOKEN_RE.findall(query.lower()):
+        if len(hangul) == 1:
+            terms.append(f'"{hangul}"*')
+        else:
+            terms.append('"' + " ".join(tokenize(hangul or word)) + '"')
+    return " AND ".join(terms) or None
+
+
+class SOTIndex:
+    """
+    SOT 기사 전문 색인 (SQLite FTS5, bm25 순위).
+    SOTGuardian에 리스너로 등록하면 기사 저장과 동시에 색인되고, 다른 프로세스가 기록한 분량은 sync()가
+    마지막 색인 위치(SOT 바이트 오프셋)부터 따라잡습니다. 기사 ID는 SOTGuardian.article_id(url)이며
+    검색 결과에 포함된 SOT 오프셋/길이로 원문 레코드를 바로 읽을 수 있습니다.
+    """
+    def __init__(self, path: str = DEFAULT_INDEX_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # 병렬 크롤러 스레드의 저장 콜백에서 호출되므로 연결 하나를 잠금으로 직렬화
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._guardian: Optional[SOTGuardian] = None
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA busy_timeout=30000")
+        self.conn.executescript(_SCHEMA)
+
+    def close(self):
+        # 싱글톤 SOTGuardian에 닫힌 연결을 쓰는 콜백이 남지 않도록 먼저 해제
+        if self._guardian is not None:
+            self._guardian.remove_listener(self.on_article_saved)
+            self._guardian = None
+        self.conn.close()
+
+    # --- 색인 ---
+    def _indexed_offset(self) -> int:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'sot_offset'").fetchone()
+        return int(row[0]) if row else 0
+
+    def _set_indexed_offset(self, offset: int):
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('sot_offset', ?)", (str(offset),))
+
+    def _upsert(self, article: Dict, offset: int, length: int):
+        """기사 1건 색인 (트랜잭션 내부에서 호출). 같은 URL이 다시 기록되면 최신 레코드로 교체"""
+        article_id = SOTGuardian.article_id(article["url"])
+        row = self.conn.execute("SELECT rowid FROM docs WHERE id = ?", (article_id,)).fetchone()
+        if row:
+            self.conn.execute("DELETE FROM docs_fts WHERE rowid = ?", (row[0],))
+            self.conn.execute("DELETE FROM docs WHERE rowid = ?", (row[0],))
+        cur = self.conn.execute(
+            "INSERT INTO docs (id, url, title, source, lang, date, sot_offset, sot_length) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (article_id, article["url"], article.get("title"), article.get("source"), article.get("lang"),
+             article.get("date"), offset, length),
+        )
+        self.conn.execute(
+            "INSERT INTO docs_fts (rowid, title, content) VALUES (?, ?, ?)",
+            (cur.lastrowid, " ".join(tokenize(article.get("title") or "")),
+             " ".join(tokenize(article.get("content") or ""))),
+        )
+
+    def on_article_saved(self, article: Dict, offset: int, length: int):
+        """SOTGuardian 리스너: 저장된 기사를 즉시 색인"""
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._upsert(article, offset, length)
+                # 색인 위치와 이어지는 레코드일 때만 위치를 전진 (그 사이 분량은 sync가 보충)
+                if self._indexed_offset() == offset:
+                    self._set_indexed_offset(offset + length)
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+
+    def _read_from(self, sot_path: str, offset: int) -> Iterator[tuple]:
+        """offset부터 완결된 줄을 (레코드, 오프셋, 길이)로 반환"""
+        with open(sot_path, 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    record = None
+                yield record, offset, len(line)
+                offset += len(line)
+
+    def sync(self, sot_path: str, rebuild: bool = False) -> int:
+        """마지막 색인 위치 이후의 SOT 레코드를 색인. 색인한 건수 반환"""
+        if not os.path.exists(sot_path):
+            return 0
+        started = time.time()
+        indexed = 0
+        with self._lock:
+            if rebuild or os.path.getsize(sot_path) < self._indexed_offset():
+                self.conn.execute("DELETE FROM docs_fts")
+                self.conn.execute("DELETE FROM docs")
+                self._set_indexed_offset(0)
+            end = self._indexed_offset()
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                for record, offset, length in self._read_from(sot_path, end):
+                    if record and record.get("url"):
+                        self._upsert(record, offset, length)
+                        indexed += 1
+                    end = offset + length
+                self._set_indexed_offset(end)
+                self.conn.execute("COMMIT")
+            except Exception:
+                self.conn.execute("ROLLBACK")
+                raise
+        if indexed:
+            logger.info(f"[SOTIndex] {indexed}건 색인 ({time.time() - started:.2f}s)")
+        return indexed
+
+    def attach(self, guardian: SOTGuardian) -> "SOTIndex":
+        """기존 SOT 미색인 분량을 따라잡고, 이후 저장되는 기사를 실시간 색인하도록 등록"""
+        self.sync(guardian.sot_path)
+        guardian.add_listener(self.on_article_saved)
+        self._guardian = guardian
+        return self
+
+    # --- 검색 ---
+    def search(self, query: str, limit: int = 20, source: Optional[str] = None,
+               lang: Optional[str] = None) -> List[Dict]:
+        """
+        검색어의 모든 단어를 포함하는 기사를 관련도(bm25) 순으로 반환.
+        각 결과: {"id", "url", "title", "source", "lang", "date", "offset", "length", "score"} (score는 낮을수록 관련도 높음)
+        """
+        match = _to_match_query(query)
+        if match is None:
+            return []
+        sql = ("SELECT d.id, d.url, d.title, d.source, d.lang, d.date, d.sot_offset, d.sot_length, "
+               f"bm25(docs_fts, {_BM25_WEIGHTS[0]}, {_BM25_WEIGHTS[1]}) AS score "
+               "FROM docs_fts JOIN docs d ON d.rowid = docs_fts.rowid WHERE docs_fts MATCH ?")
+        params: list = [match]
+        if source:
+            sql += " AND d.source = ?"
+            params.append(source)
+        if lang:
+            sql += " AND d.lang = ?"
+            params.append(lang)
+        sql += " ORDER BY score LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self.conn.execute(sql, params).fetchall()
+        keys = ("id", "url", "title", "source", "lang", "date", "offset", "length", "score")
+        return [dict(zip(keys, row)) for row in rows]
+
+    def locate(self, article_ids: List[str]) -> Dict[str, Dict]:
+        """기사 ID → {"url", "title", "offset", "length"}. 색인에 없는 ID는 결과에서 제외"""
+        located = {}
+        with self._lock:
+            for article_id in article_ids:
+                row = self.conn.execute(
+                    "SELECT url, title, sot_offset, sot_length FROM docs WHERE id = ?", (article_id,)
+                ).fetchone()
+                if row:
+                    located[article_id] = dict(zip(("url", "title", "offset", "length"), row))
+        return located
+
+    def count(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+
+
+if __name__ == "__main__":
+    from main import SOT_PATH
+
+    parser = argparse.ArgumentParser(description="SOT 전문 색인 관리 및 검색")
+    parser.add_argument("--index", default=DEFAULT_INDEX_PATH, help="색인 SQLite 경로")
+    parser.add_argument("--sot", default=SOT_PATH, help="SOT 경로")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sync_cmd = sub.add_parser("sync", help="미색인 SOT 분량 색인")
+    sync_cmd.add_argument("--rebuild", action="store_true", help="색인을 비우고 전체 재생성")
+    search_cmd = sub.add_parser("search", help="기사 검색 (관련도 순)")
+    search_cmd.add_argument("query", help="검색어 (공백으로 구분한 모든 단어 포함)")
+    search_cmd.add_argument("--limit", type=int, default=20, help="최대 결과 수")
+    search_cmd.add_argument("--source", help="소스 필터 (naver, google, google_global)")
+    search_cmd.add_argument("--lang", help="언어 필터 (ko, en)")
+    args = parser.parse_args()
+
+    index = SOTIndex(args.index)
+    try:
+        index.sync(args.sot, rebuild=args.command == "sync" and args.rebuild)
+        if args.command == "search":
+            started = time.perf_counter()
+            results = index.search(args.query, args.limit, args.source, args.lang)
+            elapsed = (time.perf_counter() - started) * 1000
+            print(f"{len(results)}건 ({elapsed:.1f}ms, 전체 {index.count()}건 중)")
+            for r in results:
+                print(f"{r['id']}  {r['score']:7.2f}  [{r['source']}] {r['title']}  {r['url']}")
+    finally:
+        index.close()
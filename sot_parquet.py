@@ -0,0 +1,235 @@
+import os
+import re
+import json
+import shutil
+import hashlib
+import logging
+import argparse
+from datetime import date, datetime
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterator, List, Optional, Sequence, Union
+from filelock import FileLock
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
+logger = logging.getLogger(__name__)
+
+DEFAULT_PARQUET_DIR = "database/news/parquet"
+
+# 한 번에 Parquet으로 변환하는 SOT 레코드 수 (메모리 상한)
+EXPORT_BATCH_SIZE = 5000
+# SOT 재작성(교체) 감지용으로 지문을 떠 두는 선두 바이트 수
+_HEAD_BYTES = 4096
+_STATE_FILE = "_export_state.json"
+
+# 파일에 저장되는 열 (source/lang/day는 디렉토리 파티션 키)
+FILE_SCHEMA = pa.schema([
+    ("title", pa.string()),
+    ("date", pa.string()),
+    ("content", pa.string()),
+    ("url", pa.string()),
+    ("wf_id", pa.string()),
+    ("collected_at", pa.string()),
+])
+PARTITION_SCHEMA = pa.schema([
+    ("day", pa.date32()),
+    ("source", pa.string()),
+    ("lang", pa.string()),
+])
+PARTITIONING = ds.partitioning(PARTITION_SCHEMA, flavor="hive")
+
+_YMD_RE = re.compile(r"(\d{4})[.\-/](\d{1,2})[.\-/](\d{1,2})")
+
+
+def normalize_day(date_str: Optional[str], collected_at: Optional[str] = None) -> Optional[date]:
+    """
+    SOT의 date 문자열을 파티션용 일자로 정규화.
+    Naver "2026.02.23. 오전 10:52", Google RSS "Tue, 24 Feb 2026 08:00:00 GMT", "2026-02-24" 형식을 지원하며
+    해석할 수 없으면 collected_at 일자를 사용
+    """
+    for value in (date_str, collected_at):
+        if not value:
+            continue
+        m = _YMD_RE.search(value)
+        try:
+            if m:
+                return date(int(m.group(1)), int(m.group(2)), int(m.group(3)))
+            return parsedate_to_datetime(value).date()
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+def _to_table(records: List[Dict]) -> pa.Table:
+    columns = {field.name: [r.get(field.name) for r in records] for field in FILE_SCHEMA}
+    columns["day"] = [normalize_day(r.get("date"), r.get("collected_at")) for r in records]
+    columns["source"] = [r.get("source") for r in records]
+    columns["lang"] = [r.get("lang") for r in records]
+    return pa.Table.from_pydict(columns, schema=pa.unify_schemas([FILE_SCHEMA, PARTITION_SCHEMA]))
+
+
+class SOTParquetExporter:
+    """
+    SOT(JSONL)를 day/source/lang 파티션의 Parquet 데이터셋으로 변환합니다.
+    마지막으로 변환한 SOT 바이트 오프셋을 기록해 두고 이후 실행에서는 추가된 레코드만 새 파일로 덧붙입니다.
+    파일명이 시작 오프셋으로 결정되므로 상태 기록 전에 중단되어도 재실행 시 같은 파일을 덮어써 중복이 생기지 않으며,
+    SOT가 잘리거나 교체되었으면(선두 지문 불일치) 전체를 다시 만듭니다.
+    """
+    def __init__(self, sot_path: str = "database/news/news_sot.jsonl", root: str = DEFAULT_PARQUET_DIR):
+        self.sot_path = sot_path
+        self.root = root
+        self.state_path = os.path.join(root, _STATE_FILE)
+
+    def _load_state(self) -> Dict:
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {"offset": 0, "head": None, "records": 0}
+
+    def _save_state(self, state: Dict):
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.state_path)
+
+    def _head_digest(self, length: int) -> str:
+        with open(self.sot_path, 'rb') as f:
+            return hashlib.sha1(f.read(min(length, _HEAD_BYTES))).hexdigest()
+
+    def _read_batches(self, offset: int) -> Iterator[tuple]:
+        """offset부터 완결된 줄만 읽어 (레코드 목록, 다음 오프셋) 배치로 반환 (기록 중인 마지막 줄은 다음 실행으로)"""
+        batch = []
+        with open(self.sot_path, 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                offset += len(line)
+                try:
+                    batch.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+                if len(batch) >= EXPORT_BATCH_SIZE:
+                    yield batch, offset
+                    batch = []
+        if batch:
+            yield batch, offset
+
+    def _write(self, root: str, start_offset: int, state: Dict) -> int:
+        """start_offset 이후 레코드를 root에 기록하고 state의 offset/records를 갱신. 기록한 레코드 수 반환"""
+        written = 0
+        state["offset"] = start_offset
+        for batch_no, (records, end_offset) in enumerate(self._read_batches(start_offset)):
+            ds.write_dataset(
+                _to_table(records), root, format="parquet", partitioning=PARTITIONING,
+                basename_template=f"part-{start_offset:012d}-{batch_no:04d}-{{i}}.parquet",
+                existing_data_behavior="overwrite_or_ignore",
+            )
+            written += len(records)
+            state["records"] += len(records)
+            state["offset"] = end_offset
+        return written
+
+    def export(self, full: bool = False) -> int:
+        """SOT → Parquet 증분 변환. 이번에 변환한 레코드 수 반환"""
+        if not os.path.exists(self.sot_path):
+            logger.warning(f"[Parquet] SOT 없음: {self.sot_path}")
+            return 0
+        os.makedirs(os.path.dirname(os.path.abspath(self.root)), exist_ok=True)
+        with FileLock(f"{self.root}.lock", timeout=600):
+            state = self._load_state()
+            size = os.path.getsize(self.sot_path)
+            if not full and state["offset"] and (size < state["offset"] or self._head_digest(state["offset"]) != state["head"]):
+                logger.warning("[Parquet] SOT가 교체/절단됨 → 전체 재생성")
+                full = True
+
+            if full:
+                # 임시 디렉토리에 전체 생성 후 교체 (생성 중에도 기존 데이터셋 조회 가능)
+                tmp_root = f"{self.root}.rebuild"
+                shutil.rmtree(tmp_root, ignore_errors=True)
+                os.makedirs(tmp_root)
+                state = {"offset": 0, "head": None, "records": 0}
+                written = self._write(tmp_root, 0, state)
+                shutil.rmtree(self.root, ignore_errors=True)
+                os.replace(tmp_root, self.root)
+            else:
+                os.makedirs(self.root, exist_ok=True)
+                written = self._write(self.root, state["offset"], state)
+
+            state["head"] = self._head_digest(state["offset"])
+            state["exported_at"] = datetime.now().isoformat()
+            self._save_state(state)
+        logger.info(f"[Parquet] 변환 {written}건 (누적 {state['records']}건) → {self.root}")
+        return written
+
+
+def open_dataset(root: str = DEFAULT_PARQUET_DIR) -> ds.Dataset:
+    """파티션 스키마가 적용된 pyarrow Dataset (세부 조회용)"""
+    return ds.dataset(root, format="parquet", partitioning=PARTITIONING)
+
+
+def _match(field: str, value: Union[str, Sequence[str]]) -> ds.Expression:
+    if isinstance(value, str):
+        return ds.field(field) == value
+    return ds.field(field).isin(list(value))
+
+
+def query_sot(start: Optional[date] = None, end: Optional[date] = None,
+              source: Union[str, Sequence[str], None] = None, wf_id: Union[str, Sequence[str], None] = None,
+              lang: Union[str, Sequence[str], None] = None, columns: Optional[List[str]] = None,
+              root: str = DEFAULT_PARQUET_DIR):
+    """
+    기간(start~end, 포함)·소스·워크플로우·언어로 필터링한 기사를 pandas DataFrame으로 반환.
+    day/source/lang 조건은 파티션 디렉토리 단위로, wf_id 조건은 row group 통계로 걸러지며
+    columns를 지정하면 해당 열만 읽습니다.
+    """
+    conditions = []
+    if start:
+        conditions.append(ds.field("day") >= start)
+    if end:
+        conditions.append(ds.field("day") <= end)
+    if source:
+        conditions.append(_match("source", source))
+    if wf_id:
+        conditions.append(_match("wf_id", wf_id))
+    if lang:
+        conditions.append(_match("lang", lang))
+
+    expression = None
+    for condition in conditions:
+        expression = condition if expression is None else expression & condition
+    return open_dataset(root).to_table(columns=columns, filter=expression).to_pandas()
+
+
+if __name__ == "__main__":
+    from main import SOT_PATH
+
+    parser = argparse.ArgumentParser(description="SOT Parquet 변환 및 조회")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    exp = sub.add_parser("export", help="SOT → Parquet 증분 변환")
+    exp.add_argument("--sot", default=SOT_PATH, help="SOT 경로")
+    exp.add_argument("--out", default=DEFAULT_PARQUET_DIR, help="Parquet 데이터셋 디렉토리")
+    exp.add_argument("--full", action="store_true", help="증분 파일을 정리하여 전체 재생성 (compaction)")
+
+    qry = sub.add_parser("query", help="기간·소스·워크플로우 조건 조회")
+    qry.add_argument("--root", default=DEFAULT_PARQUET_DIR, help="Parquet 데이터셋 디렉토리")
+    qry.add_argument("--start", type=date.fromisoformat, help="시작일 (YYYY-MM-DD)")
+    qry.add_argument("--end", type=date.fromisoformat, help="종료일 (YYYY-MM-DD, 포함)")
+    qry.add_argument("--source", help="쉼표로 구분한 소스 (naver,google,google_global)")
+    qry.add_argument("--wf-id", help="쉼표로 구분한 워크플로우 ID (wf1,wf2)")
+    qry.add_argument("--lang", help="쉼표로 구분한 언어 (ko,en)")
+    qry.add_argument("--columns", default="day,source,wf_id,title,url", help="출력할 열")
+    qry.add_argument("--limit", type=int, default=20, help="출력 행 수")
+
+    args = parser.parse_args()
+    if args.command == "export":
+        SOTParquetExporter(args.sot, args.out).export(full=args.full)
+    else:
+        split = lambda v: v.split(",") if v else None
+        df = query_sot(args.start, args.end, split(args.source), split(args.wf_id), split(args.lang),
+                       columns=split(args.columns), root=args.root)
+        print(f"{len(df)}건")
+        print(df.head(args.limit).to_string(index=False))
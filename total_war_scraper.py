@@ -1,6 +1,4 @@
 import logging
-from bs4 import BeautifulSoup
-import trafilatura
 from typing import Optional, Dict
 
 logger = logging.getLogger(__name__)
@@ -73,6 +71,8 @@ class TotalWarScraper:
                 pass  # 타임아웃이어도 진행 (일부 사이트는 p 태그 없이 구성)
 
             html = self.driver.page_source
+            from bs4 import BeautifulSoup
+            import trafilatura
             soup = BeautifulSoup(html, 'lxml')
 
             # 1. Trafilatura 재시도 (렌더링된 HTML 기반)
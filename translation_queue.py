@@ -0,0 +1,123 @@
+import os
+import json
+import logging
+import argparse
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+from sot_guardian import SOTGuardian
+from sot_index import SOTIndex
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
+logger = logging.getLogger(__name__)
+
+DEFAULT_HANDOFF_DIR = "database/news/translation"
+
+# 번역기 1회 입력 상한: 배치당 본문 문자 수 합계와 기사 수
+# (상한보다 긴 기사는 단독 배치로 구성)
+BATCH_MAX_CHARS = 24000
+BATCH_MAX_ARTICLES = 16
+
+
+class TranslationHandoff:
+    """
+    번역 대상 기사(WF2)를 번역기 입력 크기에 맞춘 배치로 묶어 JSONL 파일로 넘깁니다.
+    한 줄이 배치 하나이며, 각 기사에는 ID와 SOT 바이트 오프셋/길이, 본문 문자 수가 들어 있어
+    소비 측은 SOT를 다시 스캔하거나 제목을 대조하지 않고 read_batch()로 원문 레코드를 바로 읽습니다.
+    """
+    def __init__(self, sot_path: str, index: SOTIndex, out_dir: str = DEFAULT_HANDOFF_DIR,
+                 max_chars: int = BATCH_MAX_CHARS, max_articles: int = BATCH_MAX_ARTICLES):
+        self.sot_path = sot_path
+        self.index = index
+        self.out_dir = out_dir
+        self.max_chars = max_chars
+        self.max_articles = max_articles
+
+    def _entries(self, articles: List[Dict]) -> List[Dict]:
+        """기사(url 포함 dict) → SOT 위치가 확인된 핸드오프 항목 (SOT 순서)"""
+        ids = list(dict.fromkeys(SOTGuardian.article_id(art["url"]) for art in articles))
+        located = self.index.locate(ids)
+        entries = []
+        for article_id in ids:
+            loc = located.get(article_id)
+            if loc is None:
+                logger.warning(f"[Translation] 색인에 없는 기사 제외: {article_id}")
+                continue
+            record = SOTGuardian.read_record(self.sot_path, loc["offset"], loc["length"])
+            entries.append({
+                "id": article_id,
+                "url": loc["url"],
+                "title": loc["title"],
+                "offset": loc["offset"],
+                "length": loc["length"],
+                "content_chars": len(record.get("content", "")),
+            })
+        return sorted(entries, key=lambda e: e["offset"])
+
+    def _batches(self, entries: List[Dict]) -> List[List[Dict]]:
+        batches, current, chars = [], [], 0
+        for entry in entries:
+            if current and (chars + entry["content_chars"] > self.max_chars or len(current) >= self.max_articles):
+                batches.append(current)
+                current, chars = [], 0
+            current.append(entry)
+            chars += entry["content_chars"]
+        if current:
+            batches.append(current)
+        return batches
+
+    def write(self, articles: List[Dict], run_id: Optional[str] = None) -> Optional[str]:
+        """배치 파일 생성 후 경로 반환 (대상 기사가 없으면 None)"""
+        entries = self._entries(articles)
+        if not entries:
+            return None
+        run_id = run_id or datetime.now().strftime("%Y%m%d_%H%M%S")
+        os.makedirs(self.out_dir, exist_ok=True)
+        path = os.path.join(self.out_dir, f"translation_{run_id}.jsonl")
+
+        batches = self._batches(entries)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for batch_no, batch in enumerate(batches):
+                f.write(json.dumps({
+                    "run_id": run_id,
+                    "batch": batch_no,
+                    "sot_path": self.sot_path,
+                    "article_count": len(batch),
+                    "total_chars": sum(e["content_chars"] for e in batch),
+                    "articles": batch,
+                }, ensure_ascii=False) + "\n")
+        # 소비 측이 작성 중인 파일을 읽지 않도록 완성 후 교체
+        os.replace(tmp_path, path)
+        logger.info(f"[Translation] 번역 대상 {len(entries)}건 → 배치 {len(batches)}개: {path}")
+        return path
+
+
+def iter_batches(path: str) -> Iterator[Dict]:
+    """핸드오프 파일의 배치를 순서대로 반환"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            yield json.loads(line)
+
+
+def read_batch(batch: Dict, sot_path: Optional[str] = None) -> List[Dict]:
+    """배치의 기사 원문 레코드를 SOT 오프셋으로 직접 읽음. SOT가 교체되어 ID가 맞지 않으면 ValueError"""
+    sot_path = sot_path or batch["sot_path"]
+    records = []
+    for entry in batch["articles"]:
+        record = SOTGuardian.read_record(sot_path, entry["offset"], entry["length"])
+        if SOTGuardian.article_id(record.get("url", "")) != entry["id"]:
+            raise ValueError(f"SOT 위치 불일치 (SOT 교체 여부 확인): {entry['id']} @ {entry['offset']}")
+        records.append({**record, "id": entry["id"]})
+    return records
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="번역 핸드오프 파일 조회")
+    parser.add_argument("path", help="translation_<run_id>.jsonl 경로")
+    parser.add_argument("--sot", default=None, help="SOT 경로 (기본: 파일에 기록된 경로)")
+    args = parser.parse_args()
+
+    for batch in iter_batches(args.path):
+        print(f"[batch {batch['batch']}] {batch['article_count']}건, 본문 {batch['total_chars']}자")
+        for record in read_batch(batch, args.sot):
+            print(f"  {record['id']}  {len(record['content']):6d}자  {record['title']}")
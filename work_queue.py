@@ -0,0 +1,173 @@
+import os
+import json
+import time
+import sqlite3
+import logging
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUE_PATH = "database/news/queue/work_queue.sqlite"
+
+# 작업 최대 시도 횟수 (1차 수집 + 크롤러 재시도 라운드 3회와 동일)
+MAX_JOB_ATTEMPTS = 4
+# 임대(lease) 만료 시간: 워커가 죽으면 이 시간 후 다른 워커가 작업을 회수
+DEFAULT_LEASE_SECONDS = 300
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id            INTEGER PRIMARY KEY AUTOINCREMENT,
+    source        TEXT NOT NULL,
+    url           TEXT NOT NULL UNIQUE,
+    item          TEXT NOT NULL,
+    status        TEXT NOT NULL DEFAULT 'pending',
+    attempts      INTEGER NOT NULL DEFAULT 0,
+    available_at  REAL NOT NULL DEFAULT 0,
+    lease_owner   TEXT,
+    lease_expires REAL,
+    result        TEXT,
+    error         TEXT,
+    updated_at    REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, available_at);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class WorkQueue:
+    """
+    SQLite 기반 내구성 작업 큐. 코디네이터가 기사 작업을 적재하고, 여러 워커 프로세스가
+    임대(lease) 방식으로 작업을 가져가 수집 결과를 되돌려 놓습니다.
+    작업 상태: pending → leased → done(결과 대기) → stored(SOT 반영 완료) / failed(최종 실패)
+    여러 호스트가 공유 스토리지(NFS 등)의 같은 파일을 열 수 있도록 WAL이 아닌 롤백 저널을 사용합니다
+    (WAL의 -shm 공유 메모리 인덱스는 같은 호스트의 프로세스끼리만 공유됨).
+    """
+    def __init__(self, path: str = DEFAULT_QUEUE_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # 공유 스토리지의 여러 프로세스가 동시에 접근하므로 잠금 대기 시간을 넉넉히 둠
+        self.conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.conn.execute("PRAGMA busy_timeout=30000")
+        # 이전 버전이 WAL로 만든 큐 파일도 롤백 저널로 전환
+        self.conn.execute("PRAGMA journal_mode=DELETE")
+        self.conn.executescript(_SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def enqueue(self, source: str, url: str, item) -> bool:
+        """동일 URL은 한 번만 적재 (이미 있으면 False). 이전 실행에서 최종 실패한 작업은 다시 대기 상태로 되살림"""
+        cur = self.conn.execute(
+            "INSERT INTO jobs (source, url, item, updated_at) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(url) DO UPDATE SET status = 'pending', attempts = 0, available_at = 0, error = NULL, "
+            "item = excluded.item, updated_at = excluded.updated_at WHERE jobs.status = 'failed'",
+            (source, url, json.dumps(item, ensure_ascii=False), time.time()),
+        )
+        return cur.rowcount > 0
+
+    def lease(self, worker_id: str, lease_seconds: int = DEFAULT_LEASE_SECONDS) -> Optional[Dict]:
+        """
+        대기 중이거나 임대가 만료된 작업 하나를 원자적으로 임대.
+        임대 만료(워커 중단·무한 대기)가 시도 한도까지 반복된 작업은 회수하지 않고 최종 실패 처리
+        """
+        now = time.time()
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self.conn.execute(
+                "UPDATE jobs SET status = 'failed', error = '임대 만료 반복', lease_owner = NULL, updated_at = ? "
+                "WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?",
+                (now, now, MAX_JOB_ATTEMPTS),
+            )
+            row = self.conn.execute(
+                "SELECT id, source, url, item, attempts FROM jobs "
+                "WHERE (status = 'pending' AND available_at <= ?) "
+                "OR (status = 'leased' AND lease_expires < ? AND attempts < ?) "
+                "ORDER BY available_at, id LIMIT 1",
+                (now, now, MAX_JOB_ATTEMPTS),
+            ).fetchone()
+            if row is None:
+                self.conn.execute("COMMIT")
+                return None
+            self.conn.execute(
+                "UPDATE jobs SET status = 'leased', lease_owner = ?, lease_expires = ?, attempts = attempts + 1, "
+                "updated_at = ? WHERE id = ?",
+                (worker_id, now + lease_seconds, now, row[0]),
+            )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        return {"id": row[0], "source": row[1], "url": row[2], "item": json.loads(row[3]), "attempts": row[4] + 1}
+
+    def complete(self, job_id: int, worker_id: str, candidates: List[Dict]) -> bool:
+        """
+        워커 수집 결과(저장 후보 기사 목록)를 반환하여 코디네이터의 SOT 반영을 대기.
+        임대가 만료되어 다른 워커에게 넘어간 작업이면 반영하지 않고 False
+        """
+        cur = self.conn.execute(
+            "UPDATE jobs SET status = 'done', result = ?, lease_owner = NULL, updated_at = ? "
+            "WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+            (json.dumps(candidates, ensure_ascii=False), time.time(), job_id, worker_id),
+        )
+        return cur.rowcount > 0
+
+    def fail(self, job_id: int, worker_id: str, error: str, attempts: int) -> bool:
+        """
+        실패 작업은 시도 횟수에 비례한 지연 후 재적재, 한도 도달 시 최종 실패.
+        임대를 잃은 워커의 보고는 무시 (False)
+        """
+        return self._reschedule(job_id, error, attempts, "AND status = 'leased' AND lease_owner = ?", (worker_id,))
+
+    def requeue(self, job_id: int, error: str):
+        """코디네이터가 결과를 저장하지 못한 작업을 다시 수집 대상으로 되돌림"""
+        row = self.conn.execute("SELECT attempts FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        self._reschedule(job_id, error, row[0] if row else MAX_JOB_ATTEMPTS, "AND status = 'done'", ())
+
+    def _reschedule(self, job_id: int, error: str, attempts: int, guard: str, guard_params: tuple) -> bool:
+        if attempts >= MAX_JOB_ATTEMPTS:
+            status, available_at = "failed", 0
+        else:
+            status, available_at = "pending", time.time() + 5 * attempts  # 크롤러 재시도 라운드와 같은 점진 지연
+        cur = self.conn.execute(
+            "UPDATE jobs SET status = ?, available_at = ?, error = ?, lease_owner = NULL, updated_at = ? "
+            f"WHERE id = ? {guard}",
+            (status, available_at, error, time.time(), job_id, *guard_params),
+        )
+        return cur.rowcount > 0
+
+    def pop_results(self, limit: int = 50) -> List[Dict]:
+        """SOT 반영 대기 중인 결과 조회 (코디네이터 전용)"""
+        rows = self.conn.execute(
+            "SELECT id, source, url, result FROM jobs WHERE status = 'done' ORDER BY id LIMIT ?", (limit,)
+        ).fetchall()
+        return [{"id": r[0], "source": r[1], "url": r[2], "candidates": json.loads(r[3] or "[]")} for r in rows]
+
+    def mark_stored(self, job_id: int):
+        self.conn.execute(
+            "UPDATE jobs SET status = 'stored', result = NULL, updated_at = ? WHERE id = ?", (time.time(), job_id)
+        )
+
+    def counts(self) -> Dict[str, int]:
+        return dict(self.conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+
+    def set_discovering(self, discovering: bool):
+        """코디네이터가 아직 작업을 적재 중인지 표시 (적재 중에는 큐가 비어도 워커가 종료하지 않음)"""
+        self.conn.execute(
+            "INSERT INTO meta (key, value) VALUES ('discovering', ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            ("1" if discovering else "0",),
+        )
+
+    def is_discovering(self) -> bool:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'discovering'").fetchone()
+        return bool(row and row[0] == "1")
+
+    def is_drained(self) -> bool:
+        """수집·반영할 작업이 남아 있지 않은지 (stored/failed만 존재하고 적재도 끝남)"""
+        if self.is_discovering():
+            return False
+        counts = self.counts()
+        return not any(counts.get(s) for s in ("pending", "leased", "done"))